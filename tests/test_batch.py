@@ -0,0 +1,79 @@
+import random
+
+import pytest
+import numpy as np
+
+from tictac.board import (Board, play_random_move, RESULT_X_WINS,
+                          RESULT_O_WINS, RESULT_DRAW, RESULT_NOT_OVER)
+from tictac.batch import (get_game_results, play_batch, play_games_in_batch,
+                          play_batch_games, play_random_moves,
+                          create_batch_player)
+from tictac.minimax import create_minimax_player
+
+
+@pytest.fixture(autouse=True)
+def seed_random_number_generators():
+    random.seed(0)
+    np.random.seed(0)
+
+
+def test_get_game_results():
+    boards = np.array([[1,  1,  1, 0, -1, 0, 0, -1, 0],
+                       [1,  0, -1, 0, -1, 1, -1, 0, 1],
+                       [1,  1, -1, -1, -1, 1, 1, -1, 1],
+                       [1,  1, -1, 0, -1, 0, 1, -1, 1]])
+
+    results = get_game_results(boards)
+
+    assert list(results) == [RESULT_X_WINS, RESULT_O_WINS, RESULT_DRAW,
+                             RESULT_NOT_OVER]
+
+
+def test_play_random_moves_only_picks_empty_cells():
+    boards = np.array([[0, -1, 0, 0, -1, 0, 1, 0, 1]] * 100)
+
+    moves = play_random_moves(boards, 1)
+
+    assert set(moves) <= {0, 2, 3, 5, 7}
+
+
+def test_play_games_in_batch():
+    boards, results = play_games_in_batch(1000, play_random_moves,
+                                          play_random_moves)
+
+    assert boards.shape == (1000, 9)
+    assert RESULT_NOT_OVER not in results
+    assert list(get_game_results(boards)) == list(results)
+    for b, result in zip(boards[:20], results[:20]):
+        assert Board(b).get_game_result() == result
+
+
+def test_play_batch_from_position():
+    b = np.array([[1,  0,  0],
+                  [1, -1,  1],
+                  [0,  0, -1]]).flatten()
+    minimax = create_batch_player(create_minimax_player(False))
+
+    boards, results = play_batch([b] * 10, minimax, minimax)
+
+    assert list(results) == [RESULT_O_WINS] * 10
+
+
+def test_play_batch_illegal_move():
+    def play_occupied_cell(boards, turn):
+        return np.zeros(len(boards), dtype=int)
+
+    batch_player = create_batch_player(play_random_move)
+
+    _, results = play_games_in_batch(10, batch_player, play_occupied_cell)
+
+    assert list(results) == [RESULT_X_WINS] * 10
+
+
+def test_play_batch_games_returns_results():
+    results = play_batch_games(1000, play_random_moves, play_random_moves)
+
+    assert results.total_games == 1000
+    assert sum(results.counts.values()) == 1000
+    assert 5 <= results.get_average_moves_per_game() <= 9
+    assert 0 < results.get_average_move_time() < results.elapsed
@@ -0,0 +1,29 @@
+import numpy as np
+
+from tictac.bitboard import (FULL_MASK, IS_WIN, MASK_INDEXES, POPCOUNT,
+                             to_bitboards, get_empty_mask)
+
+
+def test_to_bitboards():
+    b = np.array([[1,  0, -1],
+                  [0,  1, -1],
+                  [0, -1,  1]]).flatten()
+
+    x_bits, o_bits = to_bitboards(b, 1, -1)
+
+    assert (x_bits, o_bits) == (0b100010001, 0b010100100)
+
+
+def test_is_win():
+    assert IS_WIN[0b100010001]
+    assert IS_WIN[0b001001001]
+    assert not IS_WIN[0b010100100]
+    assert not IS_WIN[0]
+
+
+def test_popcount_and_mask_indexes():
+    empty = get_empty_mask(0b100010001 | 0b010100100)
+
+    assert POPCOUNT[empty] == 3
+    assert MASK_INDEXES[empty] == (1, 3, 6)
+    assert MASK_INDEXES[FULL_MASK] == tuple(range(9))
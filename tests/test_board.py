@@ -1,8 +1,13 @@
+import pytest
+
 import numpy as np
 
 from tictac.board import (RESULT_X_WINS, RESULT_O_WINS, RESULT_DRAW,
                           RESULT_NOT_OVER)
-from tictac.board import Board, get_rows_cols_and_diagonals
+from tictac.board import (Board, BoardCache, TRANSFORMATIONS,
+                          get_rows_cols_and_diagonals, play_games,
+                          iterate_games, play_random_move)
+from tictac.geometry import get_geometry
 
 
 def test_get_valid_move_indexes():
@@ -79,3 +84,162 @@ def test_get_game_result_not_over():
     result = board.get_game_result()
 
     assert result == RESULT_NOT_OVER
+
+
+def test_play_move_updates_bitboards():
+    board = Board().play_move(4).play_move(0)
+
+    assert (board.x_bits, board.o_bits) == (0b000010000, 0b000000001)
+    assert np.array_equal(board.board, np.array([-1, 0, 0, 0, 1, 0, 0, 0, 0]))
+
+
+def test_play_move_illegal():
+    board = Board().play_move(4).play_move(4)
+
+    assert board.is_in_illegal_state()
+    assert board.get_game_result() == RESULT_X_WINS
+
+
+def test_get_canonical_key_same_for_all_orientations():
+    b_2d = np.array([[1,  0,  0],
+                     [1, -1,  1],
+                     [0,  0, -1]])
+
+    keys = set()
+    for t in TRANSFORMATIONS:
+        board = Board(t.transform(b_2d).flatten())
+        key, transform_index = board.get_canonical_key()
+        canonical_2d = TRANSFORMATIONS[transform_index].transform(
+            board.board_2d)
+        keys.add(key)
+
+        assert Board(canonical_2d.flatten()).get_position_key() == key
+
+    assert len(keys) == 1
+
+
+def test_board_cache_returns_transform_to_stored_orientation():
+    b_2d = np.array([[1,  0,  0],
+                     [1, -1,  1],
+                     [0,  0, -1]])
+    stored_2d = np.rot90(b_2d)
+
+    cache = BoardCache()
+    cache.set_for_position(Board(stored_2d.flatten()), "value")
+
+    for t in TRANSFORMATIONS:
+        board = Board(t.transform(b_2d).flatten())
+
+        (value, transform), found = cache.get_for_position(board)
+
+        assert (value, found) == ("value", True)
+        assert np.array_equal(transform.transform(board.board_2d), stored_2d)
+
+
+def test_board_cache_counts_hits_and_misses():
+    cache = BoardCache()
+    board = Board().play_move(0)
+    cache.set_for_position(board, "value")
+
+    cache.get_for_position(Board().play_move(2))
+    cache.get_for_position(Board().play_move(4))
+
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert sum(cache.stats.symmetry_hits) == 1
+    assert cache.get_num_entries() == 1
+    assert cache.get_size_in_bytes() > 0
+
+
+@pytest.mark.parametrize("eviction", ["lru", "lfu"])
+def test_board_cache_evicts_at_capacity(eviction):
+    cache = BoardCache(capacity=2, eviction=eviction)
+    corner, center, edge = [Board().play_move(i) for i in [0, 4, 1]]
+
+    cache.set_for_position(corner, "corner")
+    cache.set_for_position(center, "center")
+    cache.get_for_position(corner)
+    cache.set_for_position(edge, "edge")
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    assert cache.get_for_position(center) == (None, False)
+    assert cache.get_for_position(corner)[1] is True
+
+
+def test_board_cache_serves_one_geometry():
+    cache = BoardCache()
+    cache.set_for_position(Board().play_move(0), 1.0)
+    board_4x4 = Board(geometry=get_geometry(4, 4, 3)).play_move(0)
+
+    with pytest.raises(ValueError):
+        cache.get_for_position(board_4x4)
+
+    cache.reset()
+    assert cache.get_for_position(board_4x4) == (None, False)
+
+
+def test_play_move_carries_game_result():
+    board = Board()
+    for move_index in [4, 0, 2, 6, 3, 5, 1, 7]:
+        board = board.play_move(move_index)
+        assert board.get_game_result() == Board(board.board).get_game_result()
+
+    assert board.get_game_result() == RESULT_NOT_OVER
+
+    board = board.play_move(8)
+
+    assert board.get_game_result() == RESULT_DRAW
+    assert board.is_gameover()
+
+
+def test_play_move_detects_win_through_move():
+    b = np.array([[1,  1,  0],
+                  [0, -1,  0],
+                  [0,  0, -1]]).flatten()
+
+    board = Board(b).play_move(2)
+
+    assert board.get_game_result() == RESULT_X_WINS
+
+
+def test_boards_are_interned():
+    b = np.array([0, -1, 0, 0, -1, 0, 1, 0, 1])
+
+    board = Board(b)
+
+    assert Board(b.astype(float)) is board
+    assert Board().play_move(6).play_move(1).play_move(8).play_move(4) is board
+
+
+def test_board_is_immutable():
+    board = Board()
+
+    with pytest.raises(AttributeError):
+        board.x_bits = 1
+
+    with pytest.raises(ValueError):
+        board.board[0] = 1
+
+
+def test_iterate_games_yields_outcomes():
+    outcomes = []
+    for outcome in iterate_games(1000, play_random_move, play_random_move):
+        outcomes.append(outcome)
+        if len(outcomes) == 10:
+            break
+
+    assert len(outcomes) == 10
+    for outcome in outcomes:
+        assert outcome.result in [RESULT_X_WINS, RESULT_O_WINS, RESULT_DRAW]
+        assert 5 <= outcome.get_num_moves() <= 9
+        assert outcome.duration >= sum(outcome.move_times)
+
+
+def test_play_games_returns_results(capsys):
+    results = play_games(50, play_random_move, play_random_move)
+
+    assert results.total_games == 50
+    assert sum(results.counts.values()) == 50
+    assert 5 <= results.get_average_moves_per_game() <= 9
+    assert results.get_games_per_second() > 0
+    assert capsys.readouterr().out.startswith("x wins: ")
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from tictac.board import Board, BoardCache
+from tictac.cache import (LRUEviction, LFUEviction, create_eviction_policy,
+                          save_board_cache, load_board_cache)
+from tictac.geometry import TRANSFORMATIONS, get_geometry
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUEviction()
+    for key in [1, 2, 3]:
+        lru.add(key)
+    lru.touch(1)
+
+    assert lru.pop_victim() == 2
+    assert lru.pop_victim() == 3
+    assert lru.pop_victim() == 1
+
+
+def test_lfu_evicts_least_frequently_used():
+    lfu = LFUEviction()
+    for key in [1, 2, 3]:
+        lfu.add(key)
+    lfu.touch(1)
+    lfu.touch(1)
+    lfu.touch(3)
+
+    assert lfu.pop_victim() == 2
+    assert lfu.pop_victim() == 3
+
+    lfu.add(4)
+    assert lfu.pop_victim() == 4
+    assert lfu.pop_victim() == 1
+
+
+def test_create_eviction_policy():
+    assert isinstance(create_eviction_policy("lfu"), LFUEviction)
+    assert isinstance(create_eviction_policy(LRUEviction), LRUEviction)
+    with pytest.raises(ValueError):
+        create_eviction_policy("fifo")
+
+
+def test_mapped_board_cache_matches_saved_cache(tmp_path):
+    b_2d = np.array([[1,  0,  0],
+                     [1, -1,  1],
+                     [0,  0, -1]])
+    stored_2d = np.rot90(b_2d)
+    cache = BoardCache()
+    cache.set_for_position(Board(stored_2d.flatten()), 0.5)
+    cache.set_for_position(Board().play_move(4), -1.0)
+
+    path = tmp_path / "cache.npy"
+    save_board_cache(cache, path)
+    mapped_cache = load_board_cache(path)
+
+    assert len(mapped_cache) == 2
+    for t in TRANSFORMATIONS:
+        board = Board(t.transform(b_2d).flatten())
+
+        (value, transform), found = mapped_cache.get_for_position(board)
+
+        assert (value, found) == (0.5, True)
+        assert np.array_equal(transform.transform(board.board_2d), stored_2d)
+
+    assert mapped_cache.get_for_position(Board()) == (None, False)
+    with pytest.raises(ValueError):
+        mapped_cache.set_for_position(Board(), 1.0)
+
+
+def test_board_cache_falls_back_to_mapped_cache(tmp_path):
+    cache = BoardCache()
+    cache.set_for_position(Board().play_move(0), 1.0)
+    path = tmp_path / "cache.npy"
+    save_board_cache(cache, path)
+
+    layered_cache = BoardCache(fallback=load_board_cache(path))
+
+    (value, _), found = layered_cache.get_for_position(Board().play_move(8))
+    assert (value, found) == (1.0, True)
+    assert layered_cache.stats.misses == 1
+
+
+def test_mapped_board_cache_checks_geometry(tmp_path):
+    cache = BoardCache()
+    cache.set_for_position(Board().play_move(0), 1.0)
+    path = tmp_path / "cache.npy"
+    save_board_cache(cache, path)
+
+    mapped_cache = load_board_cache(path)
+
+    assert mapped_cache.geometry is Board().geometry
+    with pytest.raises(ValueError):
+        mapped_cache.get_for_position(
+            Board(geometry=get_geometry(4, 4, 3)).play_move(0))
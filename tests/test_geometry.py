@@ -0,0 +1,104 @@
+import random
+
+import pytest
+import numpy as np
+
+from tictac.board import (Board, play_game, play_random_move, RESULT_X_WINS,
+                          RESULT_O_WINS, RESULT_NOT_OVER, TRANSFORMATIONS)
+from tictac.batch import get_game_results, play_games_in_batch
+from tictac.batch import play_random_moves
+from tictac.geometry import get_geometry, STANDARD_GEOMETRY
+
+
+@pytest.fixture(autouse=True)
+def seed_random_number_generators():
+    random.seed(0)
+    np.random.seed(0)
+
+
+def test_get_geometry_is_shared():
+    assert get_geometry(3) is STANDARD_GEOMETRY
+    assert get_geometry(4, 4, 3) is get_geometry(4, 4, 3)
+
+    with pytest.raises(ValueError):
+        get_geometry(3, 3, 4)
+
+
+def test_number_of_win_lines():
+    assert len(get_geometry(3, 3, 3).win_masks) == 8
+    assert len(get_geometry(4, 4, 3).win_masks) == 24
+    assert len(get_geometry(7, 7, 4).win_masks) == 88
+    assert len(get_geometry(3, 5, 3).win_masks) == 20
+
+
+def test_get_game_result_4x4_diagonal():
+    geometry = get_geometry(4, 4, 3)
+    b = np.array([[0,  1,  0,  0],
+                  [-1, 0,  1,  0],
+                  [0, -1,  0,  1],
+                  [0,  0,  0, -1]])
+
+    board = Board(b, geometry=geometry)
+
+    assert board.get_game_result() == RESULT_X_WINS
+
+
+def test_play_move_5x5():
+    geometry = get_geometry(5, 5, 4)
+    board = Board(geometry=geometry)
+
+    for move_index in [0, 20, 6, 21, 12, 22]:
+        board = board.play_move(move_index)
+        assert board.get_game_result() == RESULT_NOT_OVER
+
+    board = board.play_move(3).play_move(23)
+
+    assert board.get_game_result() == RESULT_O_WINS
+    assert board.get_valid_move_indexes() == [1, 2, 4, 5, 7, 8, 9, 10, 11, 13,
+                                              14, 15, 16, 17, 18, 19, 24]
+
+
+def test_board_size_must_match_geometry():
+    with pytest.raises(ValueError):
+        Board(np.zeros(16), geometry=STANDARD_GEOMETRY)
+
+
+def test_canonical_key_7x7():
+    geometry = get_geometry(7, 7, 4)
+    b_2d = np.zeros((7, 7), dtype=int)
+    b_2d[0, 1] = 1
+    b_2d[3, 3] = -1
+    b_2d[6, 2] = 1
+
+    keys = {Board(t.transform(b_2d), geometry=geometry).get_canonical_key()[0]
+            for t in TRANSFORMATIONS}
+
+    assert len(keys) == 1
+
+
+def test_canonical_key_rectangle_uses_four_symmetries():
+    geometry = get_geometry(3, 4, 3)
+    b_2d = np.array([[1, 0, 0,  0],
+                     [0, 0, -1, 0],
+                     [0, 0, 0,  0]])
+
+    key, _ = Board(b_2d, geometry=geometry).get_canonical_key()
+
+    for i in geometry.transform_indexes:
+        board = Board(TRANSFORMATIONS[i].transform(b_2d), geometry=geometry)
+        assert board.get_canonical_key()[0] == key
+
+
+def test_board_and_batch_results_agree_on_larger_boards():
+    for geometry in [get_geometry(4, 4, 3), get_geometry(5, 5, 4),
+                     get_geometry(7, 7, 4)]:
+        boards, results = play_games_in_batch(50, play_random_moves,
+                                              play_random_moves, geometry)
+
+        for b, result in zip(boards, results):
+            assert Board(b, geometry=geometry).get_game_result() == result
+
+        final_board = play_game(play_random_move, play_random_move, geometry)
+        batch_result = get_game_results(np.array([final_board.board]),
+                                        geometry)
+        assert final_board.get_game_result() == batch_result[0]
@@ -1,9 +1,18 @@
 import math
+import random
+import time
 import numpy as np
+import pytest
 
-from tictac.board import BoardCache, Board
-from tictac.mcts import (perform_game_playout, find_or_create_node,
-                         calculate_values, perform_training_playouts)
+from tictac.board import Board, CELL_O, play_game, play_random_move
+from tictac.geometry import get_geometry
+from tictac.mcts import (MCTSTree, perform_game_playout, find_or_create_node,
+                         calculate_values, perform_training_playouts,
+                         play_mcts_move_with_live_playouts, PlayoutStats,
+                         PlayoutBudget, create_live_mcts_player,
+                         perform_four_phase_playout,
+                         perform_four_phase_playouts, play_most_visited_move,
+                         save_tree, load_tree)
 
 
 def test_play_mcts_move():
@@ -12,7 +21,7 @@ def test_play_mcts_move():
                      [-1, 1, -1]])
     b = b_2d.flatten()
     board = Board(b)
-    nc = BoardCache()
+    nc = MCTSTree()
 
     parent_node = find_or_create_node(nc, board)
     actual_stats = (parent_node.visits, parent_node.wins, parent_node.draws, parent_node.losses)
@@ -68,3 +77,239 @@ def test_play_mcts_move():
     values = calculate_values(nc, board)
     expected_values = [(2, 1.3104087632087014), (5, 1.2416350528348057)]
     assert list(values) == expected_values
+
+
+def test_seeded_training_playouts_keep_first_max_ties_by_default():
+    tree = MCTSTree()
+    perform_training_playouts(tree, Board(), 100, False)
+    seeded_tree = MCTSTree()
+    perform_training_playouts(seeded_tree, Board(), 100, False,
+                              rng=random.Random(1))
+    assert np.array_equal(seeded_tree.visits, tree.visits)
+
+    randomized_tree = MCTSTree()
+    perform_training_playouts(randomized_tree, Board(), 100, False,
+                              rng=random.Random(1), randomize_ties=True)
+    assert find_or_create_node(randomized_tree, Board()).visits == 100
+
+
+def test_mcts_tree_grows_and_links_edges():
+    tree = MCTSTree(capacity=2)
+    board = Board()
+    root_id = tree.find_or_create_node_id(board)
+
+    child_ids = []
+    for move_index in board.get_valid_move_indexes():
+        child_id = tree.find_or_create_node_id(board.play_move(move_index))
+        tree.add_edge(root_id, child_id)
+        tree.add_edge(root_id, child_id)
+        child_ids.append(child_id)
+
+    # symmetrical moves share one node: a corner, an edge and the center
+    assert len(tree) == 4
+    assert sorted(set(child_ids)) == sorted(tree.get_child_ids(root_id))
+    assert list(tree.get_parent_ids(child_ids[0])) == [root_id]
+    assert tree.num_edges == 3
+    assert len(tree.visits) >= 4
+
+    tree.add_visits(root_id, 7)
+    assert tree.get_total_parent_visits(child_ids[0]) == 7
+    assert find_or_create_node(tree, board).visits == 7
+
+
+def test_tree_serves_one_geometry():
+    tree = MCTSTree()
+    perform_training_playouts(tree, Board(), 10, False)
+
+    with pytest.raises(ValueError):
+        tree.find_node_id(Board(geometry=get_geometry(4, 4, 3)))
+
+
+def test_live_playouts_stop_at_playout_budget():
+    tree = MCTSTree()
+    stats = PlayoutStats()
+
+    updated_board = play_mcts_move_with_live_playouts(Board(), tree, 50,
+                                                      stats=stats)
+
+    assert find_or_create_node(tree, Board()).visits == 50
+    assert (stats.moves, stats.playouts) == (1, 50)
+    assert stats.get_playouts_per_second() > 0
+    assert updated_board.get_turn() == CELL_O
+
+
+def test_live_playouts_stop_at_time_budget():
+    b = np.array([[1,  1,  0],
+                  [1, -1,  0],
+                  [-1, 1, -1]]).flatten()
+    tree = MCTSTree()
+    stats = PlayoutStats()
+    play = create_live_mcts_player(time_limit_ms=20, node_cache=tree,
+                                   stats=stats)
+
+    start = time.perf_counter()
+    updated_board = play(Board(b))
+
+    assert time.perf_counter() - start < 0.5
+    assert stats.playouts > 0
+    assert updated_board is Board(b).play_move(2)
+
+
+def test_live_playouts_with_time_budget_are_not_capped():
+    b = np.array([[1,  1,  0],
+                  [1, -1,  0],
+                  [-1, 1, -1]]).flatten()
+    stats = PlayoutStats()
+
+    start = time.perf_counter()
+    play_mcts_move_with_live_playouts(Board(b), MCTSTree(),
+                                      time_limit_ms=300, stats=stats)
+
+    assert time.perf_counter() - start >= 0.3
+    assert stats.playouts > 200
+
+
+def test_live_playouts_default_to_playout_budget():
+    stats = PlayoutStats()
+    play_mcts_move_with_live_playouts(Board(), MCTSTree(), stats=stats)
+    create_live_mcts_player(node_cache=MCTSTree(), stats=stats)(Board())
+    assert stats.playouts == 400
+
+    with pytest.raises(ValueError):
+        PlayoutBudget()
+
+
+def test_enforce_memory_cap_keeps_subtree_of_current_position():
+    tree = MCTSTree(max_nodes=50)
+    perform_training_playouts(tree, Board(), 300, False)
+    assert len(tree) > 50
+
+    board = Board().play_move(4).play_move(0)
+    visits = find_or_create_node(tree, board).visits
+    child_visits = find_or_create_node(tree, board.play_move(8)).visits
+
+    tree.enforce_memory_cap(board)
+
+    assert len(tree) <= 50
+    assert tree.find_node_id(Board()) is None
+    assert find_or_create_node(tree, board).visits == visits
+    assert find_or_create_node(tree, board.play_move(8)).visits == child_visits
+
+    perform_training_playouts(tree, board, 100, False)
+    assert find_or_create_node(tree, board).visits == visits + 100
+
+
+def test_live_playouts_reuse_tree_between_moves():
+    tree = MCTSTree()
+    board = Board()
+
+    board = play_mcts_move_with_live_playouts(board, tree, 100)
+    visits = find_or_create_node(tree, board).visits
+    play_mcts_move_with_live_playouts(board, tree, 100)
+
+    assert visits > 0
+    assert find_or_create_node(tree, board).visits == visits + 100
+
+
+def test_four_phase_playout_adds_one_node_per_playout():
+    tree = MCTSTree()
+    board = Board()
+
+    for playouts in range(1, 20):
+        perform_four_phase_playout(tree, board, num_rollouts=8)
+        assert len(tree) == playouts + 1
+
+    assert find_or_create_node(tree, board).visits == 19 * 8
+
+
+def test_four_phase_playouts_find_winning_move():
+    b = np.array([[1,  1,  0],
+                  [1, -1,  0],
+                  [-1, 1, -1]]).flatten()
+    tree = MCTSTree()
+
+    perform_four_phase_playouts(tree, Board(b), 50)
+
+    assert play_most_visited_move(Board(b), tree) is Board(b).play_move(2)
+    child = find_or_create_node(tree, Board(b).play_move(2))
+    assert child.wins == child.visits
+
+
+def test_seeded_four_phase_playouts_are_reproducible():
+    trees = []
+    for global_seed in [1, 2]:
+        np.random.seed(global_seed)
+        tree = MCTSTree()
+        perform_four_phase_playouts(tree, Board(), 100,
+                                    rng=random.Random(7))
+        trees.append(tree)
+
+    for name in ["visits", "wins", "draws", "losses"]:
+        assert np.array_equal(getattr(trees[0], name),
+                              getattr(trees[1], name))
+
+
+def test_save_and_load_tree(tmp_path):
+    tree = MCTSTree()
+    perform_training_playouts(tree, Board(), 200, False)
+    board = Board().play_move(4).play_move(0)
+    expected_values = list(calculate_values(tree, board))
+    expected_stats = [(n.visits, n.wins, n.draws, n.losses) for n in
+                      [find_or_create_node(tree, b) for b in [Board(), board]]]
+
+    save_tree(tree, tmp_path / "tree")
+    loaded_tree = load_tree(tmp_path / "tree")
+
+    assert len(loaded_tree) == len(tree)
+    assert loaded_tree.geometry is Board().geometry
+    assert [(n.visits, n.wins, n.draws, n.losses) for n in
+            [find_or_create_node(loaded_tree, b)
+             for b in [Board(), board]]] == expected_stats
+    assert list(calculate_values(loaded_tree, board)) == expected_values
+    assert loaded_tree.num_edges == tree.num_edges
+
+    perform_training_playouts(loaded_tree, Board(), 100, False)
+    perform_training_playouts(tree, Board(), 100, False)
+    assert (find_or_create_node(loaded_tree, Board()).visits
+            == find_or_create_node(tree, Board()).visits)
+    assert len(loaded_tree) == len(tree)
+    assert loaded_tree.num_edges == tree.num_edges
+
+
+def test_load_tree_does_not_change_file(tmp_path):
+    tree = MCTSTree()
+    perform_training_playouts(tree, Board(), 50, False)
+    save_tree(tree, tmp_path / "tree")
+
+    loaded_tree = load_tree(tmp_path / "tree")
+    perform_training_playouts(loaded_tree, Board(), 50, False)
+
+    reloaded_tree = load_tree(tmp_path / "tree")
+    assert find_or_create_node(reloaded_tree, Board()).visits == 50
+    assert find_or_create_node(loaded_tree, Board()).visits == 100
+
+
+def test_save_and_load_empty_tree(tmp_path):
+    save_tree(MCTSTree(), tmp_path / "tree")
+
+    tree = load_tree(tmp_path / "tree")
+    perform_training_playouts(tree, Board(), 10, False)
+
+    assert find_or_create_node(tree, Board()).visits == 10
+
+
+def test_live_playouts_reuse_one_tree_across_games():
+    np.random.seed(0)
+    tree = MCTSTree(max_nodes=100)
+    play = create_live_mcts_player(num_playouts=50, node_cache=tree)
+
+    for _ in range(5):
+        play_game(play, play_random_move)
+        play_game(play_random_move, play)
+        tree.enforce_memory_cap(Board().play_move(4))
+        assert len(tree) <= 100
+
+    play_game(play, play)
+    visits = tree.visits[:tree.num_nodes]
+    for node_id in range(tree.num_nodes):
+        assert visits[node_id] <= tree.get_total_parent_visits(node_id)
@@ -1,11 +1,19 @@
+import math
+import time
+
 import pytest
 
 import numpy as np
 
-from tictac.minimax import cache
+from tictac.minimax import cache, negamax, EXACT
+from tictac.minimax import (evaluate_open_lines, search_iteratively,
+                            SearchBudget, create_iterative_deepening_player,
+                            MinimaxEngine, create_minimax_player)
 from tictac.minimax import (get_position_value, get_move_value_pairs,
                             play_minimax_move)
-from tictac.board import Board
+from tictac.board import Board, BoardCache, CELL_O, play_game
+from tictac.cache import save_board_cache, load_board_cache
+from tictac.geometry import get_geometry
 from tictac.board import RESULT_X_WINS, RESULT_O_WINS, RESULT_DRAW
 from tictac.board import get_symmetrical_board_orientations
 
@@ -13,6 +21,8 @@ from tictac.board import get_symmetrical_board_orientations
 @pytest.fixture(autouse=True)
 def reset_cache():
     cache.reset()
+    yield
+    cache.reset()
 
 
 def test_get_position_value_x_wins():
@@ -155,3 +165,102 @@ def test_get_position_value_from_cache():
     (value, _), found = cache.get_for_position(Board(b))
 
     assert (value, found) == (-1, True)
+
+
+def test_get_position_value_stores_bounds_in_transposition_table():
+    value = get_position_value(Board())
+
+    assert value == RESULT_DRAW
+    (entry, _), found = cache.get_for_position(Board())
+    assert found and entry == (RESULT_DRAW, EXACT)
+    assert len(cache) < 765
+
+
+def test_negamax_returns_value_for_player_to_move():
+    b = np.array([[1,  0,  0],
+                  [1, -1,  1],
+                  [0,  0, -1]]).flatten()
+
+    assert negamax(Board(b), -math.inf, math.inf) == 1
+
+
+def test_evaluate_open_lines():
+    assert evaluate_open_lines(Board()) == 0
+    assert evaluate_open_lines(Board().play_move(4)) > 0
+    assert evaluate_open_lines(Board().play_move(4).play_move(0)) > 0
+    assert -1 < evaluate_open_lines(Board().play_move(4).play_move(0)) < 1
+
+
+def test_iterative_deepening_finds_best_move():
+    b = np.array([[1,  0,  0],
+                  [1, -1,  1],
+                  [0,  0, -1]]).flatten()
+
+    move, depth = search_iteratively(Board(b), SearchBudget(), BoardCache())
+
+    assert (move, depth) == (6, 4)
+
+
+def test_iterative_deepening_returns_move_when_budget_runs_out():
+    board = Board(geometry=get_geometry(6, 6, 4))
+    budget = SearchBudget(node_limit=500)
+
+    move, depth = search_iteratively(board, budget, BoardCache())
+
+    assert move in board.get_valid_move_indexes()
+    assert depth < 36
+
+
+def test_iterative_deepening_player_respects_time_limit():
+    play = create_iterative_deepening_player(time_limit=0.05)
+    board = Board(geometry=get_geometry(7, 7, 4))
+
+    start = time.perf_counter()
+    updated_board = play(board)
+
+    assert time.perf_counter() - start < 0.5
+    assert updated_board.get_turn() == CELL_O
+
+
+def test_iterative_deepening_player_draws_against_itself():
+    play = create_iterative_deepening_player()
+
+    assert play_game(play, play).get_game_result() == RESULT_DRAW
+
+
+def test_minimax_engines_are_independent():
+    engine = MinimaxEngine(capacity=100)
+    other_engine = MinimaxEngine(capacity=100)
+
+    assert engine.get_position_value(Board()) == RESULT_DRAW
+
+    assert engine.get_num_entries() > 0
+    assert engine.nodes > 0
+    assert other_engine.get_num_entries() == 0
+    assert len(cache) == 0
+
+    engine.get_position_value(Board().play_move(4))
+    assert engine.get_hit_rate() > 0
+
+
+def test_minimax_engine_reuses_saved_cache(tmp_path):
+    board = Board().play_move(0).play_move(4)
+    engine = MinimaxEngine()
+    move_value_pairs = engine.get_move_value_pairs(board)
+    path = tmp_path / "minimax.npy"
+    save_board_cache(engine.cache, path)
+
+    mapped_cache = load_board_cache(path)
+    other_engine = MinimaxEngine(fallback=mapped_cache)
+
+    assert other_engine.get_move_value_pairs(board) == move_value_pairs
+    assert mapped_cache.stats.hits > 0
+    assert other_engine.nodes < engine.nodes
+
+
+def test_minimax_engine_player():
+    engine = MinimaxEngine()
+    play = create_minimax_player(False, engine=engine)
+
+    assert play_game(play, play).get_game_result() == RESULT_DRAW
+    assert engine.get_size_in_bytes() > 0
@@ -0,0 +1,176 @@
+import time
+
+import numpy as np
+
+from tictac.board import (Board, BoardCache, GameResults, play_random_move,
+                          CELL_X, CELL_O, RESULT_X_WINS, RESULT_O_WINS,
+                          RESULT_DRAW)
+from tictac.cache import SharedTranspositionTable
+from tictac.geometry import get_geometry
+from tictac.minimax import (create_minimax_player, search_iteratively,
+                            SearchBudget, EXACT)
+from tictac.parallel import (collect_game_results_in_parallel,
+                             split_into_shards, merge_results,
+                             search_in_parallel,
+                             create_parallel_minimax_player, split_evenly,
+                             perform_training_playouts_in_parallel)
+from tictac.mcts import find_or_create_node
+from tictac import parallel
+
+
+def test_split_into_shards():
+    assert split_into_shards(10, 4) == [(0, 3), (3, 3), (6, 2), (8, 2)]
+    assert split_into_shards(8, 4) == [(0, 2), (2, 2), (4, 2), (6, 2)]
+    assert split_into_shards(2, 4) == [(0, 1), (1, 1)]
+    assert split_into_shards(0, 4) == []
+
+
+def test_merge_results():
+    shard_a = GameResults()
+    shard_a.add_games(RESULT_X_WINS, 1, 5, 0.5, 1.0)
+    shard_a.add_games(RESULT_DRAW, 3, 27, 1.5, 1.0)
+    shard_b = GameResults()
+    shard_b.add_games(RESULT_O_WINS, 2, 12, 1.0, 2.0)
+
+    results = merge_results([shard_a, shard_b])
+
+    assert results.counts == {RESULT_X_WINS: 1, RESULT_O_WINS: 2,
+                              RESULT_DRAW: 3}
+    assert results.total_games == 6
+    assert results.total_moves == 44
+    assert results.get_average_move_time() == 3.0 / 44
+
+
+def test_collect_game_results_in_parallel_is_reproducible():
+    results = collect_game_results_in_parallel(600, play_random_move,
+                                               play_random_move, processes=3,
+                                               seed=42)
+    results_again = collect_game_results_in_parallel(600, play_random_move,
+                                                     play_random_move,
+                                                     processes=2, seed=42)
+
+    assert results.total_games == 600
+    assert results.counts == results_again.counts
+
+
+def test_parallel_functions_run_serially_without_fork(monkeypatch):
+    results = collect_game_results_in_parallel(60, play_random_move,
+                                               play_random_move, processes=2,
+                                               seed=3)
+    tree = perform_training_playouts_in_parallel(Board(), 40, processes=2,
+                                                 seed=3)
+
+    monkeypatch.setattr(parallel, "can_fork", lambda: False)
+    serial_results = collect_game_results_in_parallel(60, play_random_move,
+                                                      play_random_move,
+                                                      processes=2, seed=3)
+    serial_tree = perform_training_playouts_in_parallel(Board(), 40,
+                                                        processes=2, seed=3)
+
+    assert serial_results.counts == results.counts
+    assert np.array_equal(serial_tree.visits, tree.visits)
+
+
+def test_collect_game_results_in_parallel_with_stateful_strategy():
+    play_minimax_move = create_minimax_player(False)
+
+    results = collect_game_results_in_parallel(20, play_minimax_move,
+                                               play_minimax_move, processes=2)
+
+    assert results.counts == {RESULT_X_WINS: 0, RESULT_O_WINS: 0,
+                              RESULT_DRAW: 20}
+
+
+def test_collect_game_results_in_parallel_restarts_state_per_shard():
+    moves_played = []
+    play_minimax_move = create_minimax_player(False)
+
+    def forfeit_first_move(board):
+        moves_played.append(board)
+        if len(moves_played) == 1:
+            return board.play_move(-1)
+        return play_minimax_move(board)
+
+    results = collect_game_results_in_parallel(10, forfeit_first_move,
+                                               play_random_move, processes=2,
+                                               seed=1)
+
+    assert results.total_games == 10
+    assert results.counts[RESULT_O_WINS] == 2
+    assert moves_played == []
+
+
+def test_shared_transposition_table():
+    table = SharedTranspositionTable(64)
+    try:
+        board = Board().play_move(0)
+        table.set_for_position(board, (0.5, EXACT, 3))
+
+        (entry, _), found = table.get_for_position(Board().play_move(8))
+
+        assert (entry, found) == ((0.5, EXACT, 3), True)
+        assert table.get_for_position(Board()) == (None, False)
+        assert len(table) == 1
+    finally:
+        table.release()
+
+
+def test_shared_transposition_table_stores_wide_keys():
+    table = SharedTranspositionTable(64)
+    try:
+        board = Board(geometry=get_geometry(7, 7, 4))
+        board = board.play_move(24).play_move(16)
+        assert board.get_canonical_key()[0] > 2 ** 64
+
+        table.set_for_position(board, (0.25, EXACT, 2))
+
+        assert table.get_for_position(board) == (((0.25, EXACT, 2), None),
+                                                 True)
+        assert table.get_for_position(board.play_move(0)) == (None, False)
+    finally:
+        table.release()
+
+
+def test_search_in_parallel_matches_sequential_search():
+    b = np.array([[1,  0,  0],
+                  [1, -1,  1],
+                  [0,  0, -1]]).flatten()
+    board = Board(b)
+
+    move, depth = search_in_parallel(board, processes=2)
+
+    assert (move, depth) == search_iteratively(board, SearchBudget(),
+                                               BoardCache())
+
+
+def test_parallel_minimax_player_respects_time_limit():
+    play = create_parallel_minimax_player(processes=2, time_limit=0.2)
+    board = Board(geometry=get_geometry(6, 6, 4))
+
+    for turn in [CELL_O, CELL_X]:
+        start = time.perf_counter()
+        board = play(board)
+
+        assert time.perf_counter() - start <= 0.2 + 0.1
+        assert board.get_turn() == turn
+
+
+def test_split_evenly():
+    assert split_evenly(10, 4) == [3, 3, 2, 2]
+    assert split_evenly(2, 3) == [1, 1, 0]
+
+
+def test_perform_training_playouts_in_parallel_merges_trees():
+    tree = perform_training_playouts_in_parallel(Board(), 200, processes=2,
+                                                 seed=1)
+
+    root = find_or_create_node(tree, Board())
+    assert root.visits == 200
+    assert sum(find_or_create_node(tree, Board().play_move(m)).visits
+               for m in [0, 1, 4]) == 200
+    assert tree.get_total_parent_visits(
+        tree.find_node_id(Board().play_move(4))) == 200
+
+    same_tree = perform_training_playouts_in_parallel(Board(), 200,
+                                                      processes=2, seed=1)
+    assert np.array_equal(same_tree.visits, tree.visits)
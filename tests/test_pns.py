@@ -0,0 +1,57 @@
+import numpy as np
+
+from tictac.board import (Board, CELL_X, CELL_O, RESULT_X_WINS,
+                          RESULT_DRAW)
+from tictac.geometry import get_geometry
+from tictac.pns import (prove_win, prove_at_least_draw,
+                        solve_with_proof_numbers, PROVEN, DISPROVEN, UNKNOWN)
+from tictac.retrograde import get_perfect_play_table
+from tictac.stateindex import get_state_index
+
+
+def test_solve_empty_board_is_draw():
+    value, proofs = solve_with_proof_numbers(Board())
+
+    assert value == RESULT_DRAW
+    assert [p.status for p in proofs] == [DISPROVEN, PROVEN]
+    assert all(p.nodes > 0 for p in proofs)
+
+
+def test_prove_win_for_player_to_move_and_opponent():
+    b = np.array([[1,  0,  0],
+                  [1, -1,  1],
+                  [0,  0, -1]]).flatten()
+
+    assert prove_win(Board(b), CELL_O).status == PROVEN
+    assert prove_win(Board(b), CELL_X).status == DISPROVEN
+    assert prove_at_least_draw(Board(b), CELL_X).status == DISPROVEN
+
+
+def test_solve_matches_perfect_play_table():
+    table = get_perfect_play_table()
+    state_index = get_state_index()
+
+    for state_id in range(0, len(state_index), 53):
+        board = state_index.get_board(state_id)
+
+        value, _ = solve_with_proof_numbers(board)
+
+        assert value == table.get_value(board)
+
+
+def test_prove_reports_unknown_when_budget_runs_out():
+    board = Board(geometry=get_geometry(4, 4, 4))
+
+    proof = prove_win(board, CELL_X, node_limit=100)
+
+    assert proof.status == UNKNOWN
+    assert proof.nodes == 101
+
+
+def test_prove_finished_game():
+    b = np.array([[1, 1,  1],
+                  [-1, -1, 0],
+                  [0,  0,  0]]).flatten()
+
+    assert solve_with_proof_numbers(Board(b))[0] == RESULT_X_WINS
+    assert prove_win(Board(b), CELL_O).status == DISPROVEN
@@ -7,7 +7,9 @@ from torch.nn import MSELoss
 
 from tictac.board import Board
 from tictac.qneural import TicTacNet, NetContext
-from tictac.qneural import convert_to_tensor, create_qneural_player
+from tictac.qneural import (convert_to_tensor, create_qneural_player,
+                            create_qneural_batch_player, get_q_values,
+                            backpropagate)
 
 
 @pytest.fixture(autouse=True)
@@ -51,3 +53,40 @@ def test_play_qneural_move():
 
     assert np.array_equal(updated_board.board,
                           np.array([1, -1, 0, 1, -1, 1, -1, 1, -1]))
+
+
+def test_qneural_batch_player_matches_single_player():
+    net = TicTacNet()
+    target_net = TicTacNet()
+    sgd = torch.optim.SGD(net.parameters(), lr=0.1, weight_decay=0)
+    loss_function = MSELoss()
+    net_context = NetContext(net, target_net, sgd, loss_function)
+
+    play = create_qneural_player(net_context)
+    play_batch = create_qneural_batch_player(net_context)
+
+    boards = np.array([[1,  0,  0, 1, -1, 1, -1, 1, -1],
+                       [0,  0,  0, 0,  0, 0,  0, 0,  0],
+                       [1, -1,  0, 0,  1, 0,  0, 0, -1]])
+
+    moves = play_batch(boards, None)
+
+    for b, move in zip(boards, moves):
+        assert play(Board(b)) is Board(b).play_move(move)
+
+
+def test_backpropagate_symmetries():
+    net = TicTacNet()
+    target_net = TicTacNet()
+    sgd = torch.optim.SGD(net.parameters(), lr=0.1, weight_decay=0)
+    loss_function = MSELoss()
+    net_context = NetContext(net, target_net, sgd, loss_function,
+                             augment_symmetries=True)
+
+    board = Board(np.array([1, 0, 0, 0, -1, 0, 0, 0, 0]))
+    before = get_q_values(board, net).detach()
+
+    backpropagate(net_context, board, 2, 1.0)
+
+    after = get_q_values(board, net).detach()
+    assert after[2] > before[2]
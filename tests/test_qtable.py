@@ -7,7 +7,8 @@ from collections import deque
 from tictac.board import Board, CELL_X, CELL_O, new_board, play_random_move
 from tictac.qtable import (INITIAL_Q_VALUES_FOR_O, INITIAL_Q_VALUES_FOR_X,
                            QTable, choose_move_index, create_training_player,
-                           play_training_game, get_move_average_q_value_pairs)
+                           play_training_game, get_move_average_q_value_pairs,
+                           create_q_table_batch_player)
 
 
 @pytest.fixture(autouse=True)
@@ -358,3 +359,22 @@ def test_update_q_value():
     qvalues = qtable.get_q_values(board_rot90_flipud)
 
     assert qvalues == expected_qvalues
+
+
+def test_q_table_batch_player_matches_single_player():
+    q_tables = [QTable(), QTable()]
+    for q_table in q_tables:
+        for _ in range(200):
+            board = Board()
+            while not board.is_gameover():
+                move_index = board.get_random_valid_move_index()
+                q_table.update_q_value(board, move_index, random.random())
+                board = board.play_move(move_index)
+
+    play_batch = create_q_table_batch_player(q_tables)
+
+    boards = [Board(), Board().play_move(4), Board().play_move(4).play_move(0),
+              Board().play_move(0).play_move(8).play_move(2)]
+    for board in boards:
+        move = play_batch(board.board[np.newaxis], board.get_turn())[0]
+        assert move == choose_move_index(q_tables, board, 0)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from tictac.board import Board, RESULT_DRAW, RESULT_O_WINS
+from tictac.minimax import (cache, get_move_value_pairs,
+                            choose_min_or_max_for_comparison,
+                            create_minimax_player, play_minimax_move,
+                            MinimaxEngine)
+from tictac.board import play_game
+from tictac.retrograde import PerfectPlayTable, get_perfect_play_table
+from tictac.stateindex import get_state_index
+
+
+def test_perfect_play_table_matches_minimax():
+    table = get_perfect_play_table()
+    state_index = get_state_index()
+    cache.reset()
+
+    for state_id in range(0, len(state_index), 37):
+        board = state_index.get_board(state_id)
+        if board.is_gameover():
+            continue
+
+        move_value_pairs = get_move_value_pairs(board)
+        min_or_max = choose_min_or_max_for_comparison(board)
+        best_value = min_or_max(v for _, v in move_value_pairs)
+
+        assert table.get_value(board) == best_value
+        assert table.get_optimal_move_indexes(board) == tuple(
+            m for m, v in move_value_pairs if v == best_value)
+
+    cache.reset()
+
+
+def test_perfect_play_table_values():
+    table = get_perfect_play_table()
+
+    b = np.array([[1,  0,  0],
+                  [1, -1,  1],
+                  [0,  0, -1]]).flatten()
+
+    assert table.get_value(Board()) == RESULT_DRAW
+    assert table.get_value(Board(b)) == RESULT_O_WINS
+    assert table.get_optimal_move_indexes(Board(b)) == (6,)
+
+
+def test_perfect_play_table_save_and_load(tmp_path):
+    table = get_perfect_play_table()
+    path = tmp_path / "perfect_play.npz"
+
+    table.save(path)
+    loaded_table = PerfectPlayTable.load(path)
+
+    assert np.array_equal(loaded_table.values, table.values)
+    assert np.array_equal(loaded_table.optimal_move_masks,
+                          table.optimal_move_masks)
+
+
+def test_minimax_player_uses_perfect_play_table():
+    table = get_perfect_play_table()
+    play = create_minimax_player(True, table)
+
+    board = play_game(play, play)
+
+    assert board.get_game_result() == RESULT_DRAW
+    engine = MinimaxEngine(perfect_play_table=table)
+    assert play_minimax_move(Board(), False, engine) is Board().play_move(0)
+
+
+def test_minimax_player_searches_positions_missing_from_table():
+    table = get_perfect_play_table()
+    board = Board(np.array([1, 1, 0, -1, 0, 0, 0, 0, 1]))
+    engine = MinimaxEngine(perfect_play_table=table)
+
+    assert not table.covers(board)
+    assert play_minimax_move(board, False, engine) is play_minimax_move(
+        board, False, MinimaxEngine())
+
+
+def test_get_perfect_play_table_saves_to_each_path(tmp_path):
+    get_perfect_play_table()
+    path = tmp_path / "perfect_play.npz"
+
+    table = get_perfect_play_table(path)
+
+    assert path.exists()
+    assert get_perfect_play_table(path) is table
@@ -0,0 +1,69 @@
+import numpy as np
+
+from tictac.board import Board, CELL_X, RESULT_NOT_OVER, RESULT_X_WINS
+from tictac.stateindex import StateIndex, NO_STATE, get_state_index
+
+
+def test_state_index_counts():
+    index = get_state_index()
+
+    assert len(index) == 5478
+    assert len(set(index.canonical_ids.tolist())) == 765
+
+
+def test_state_index_tables():
+    index = get_state_index()
+
+    b = np.array([[1,  1,  0],
+                  [0, -1,  0],
+                  [0,  0, -1]]).flatten()
+    board = Board(b)
+
+    state_id = index.get_id(board)
+
+    assert index.turns[state_id] == CELL_X
+    assert index.results[state_id] == RESULT_NOT_OVER
+    assert index.get_valid_move_indexes(state_id) == [2, 3, 5, 6, 7]
+    assert index.child_ids[state_id, 0] == NO_STATE
+
+    child_id = index.child_ids[state_id, 2]
+    assert index.get_id(board.play_move(2)) == child_id
+    assert np.array_equal(index.get_board(child_id).board,
+                          board.play_move(2).board)
+
+
+def test_state_index_canonical_id():
+    index = get_state_index()
+
+    b_2d = np.array([[1,  1,  1],
+                     [0, -1,  0],
+                     [0, -1,  0]])
+    board = Board(b_2d.flatten())
+    board_rot90 = Board(np.rot90(b_2d).flatten())
+
+    assert index.get_canonical_id(board) == index.get_canonical_id(board_rot90)
+    assert index.results[index.get_id(board)] == RESULT_X_WINS
+    assert index.get_id(Board(np.array([1, 1, 1, 1, 0, 0, 0, 0, 0]))) == NO_STATE
+    assert index.get_canonical_id(
+        Board(np.array([1, 1, 0, -1, 0, 0, 0, 0, 1]))) == NO_STATE
+
+
+def test_state_index_save_and_load(tmp_path):
+    index = get_state_index()
+    path = tmp_path / "states.npz"
+
+    index.save(path)
+    loaded = StateIndex.load(path)
+
+    assert np.array_equal(loaded.child_ids, index.child_ids)
+    assert np.array_equal(loaded.canonical_ids, index.canonical_ids)
+
+
+def test_get_state_index_saves_to_each_path(tmp_path):
+    get_state_index()
+    path = tmp_path / "states.npz"
+
+    index = get_state_index(path)
+
+    assert path.exists()
+    assert get_state_index(path) is index
@@ -1,5 +1,8 @@
 import numpy as np
-from tictac.transform import Transform, Rotate90, Flip
+from tictac.transform import (Transform, Identity, Rotate90, Flip,
+                              compile_permutations, invert_permutations,
+                              get_all_orientations,
+                              get_all_move_index_orientations)
 
 
 def test_transform():
@@ -16,3 +19,57 @@ def test_transform():
     reversed_b = t.reverse(transformed_b)
 
     assert np.array_equal(reversed_b,  b)
+
+
+def test_transform_boards_matches_transform():
+    b = np.array([[1,  1, -1],
+                  [-1, 1,  0],
+                  [1,  0, -1]])
+    t = Transform(Rotate90(1), Flip(np.fliplr))
+
+    boards = np.array([b.flatten(), -b.flatten()])
+    transformed = t.transform_boards(boards, (3, 3))
+
+    assert np.array_equal(transformed[0], t.transform(b).flatten())
+    assert np.array_equal(transformed[1], t.transform(-b).flatten())
+    assert np.array_equal(t.reverse_boards(transformed, (3, 3)), boards)
+
+
+def test_transform_move_indexes():
+    b = np.zeros(9, dtype=int)
+    b[[1, 5]] = 1
+    t = Rotate90(1)
+
+    transformed_b = t.transform_boards(b, (3, 3))
+    move_indexes = t.transform_move_indexes(np.array([1, 5]), (3, 3))
+
+    assert set(np.flatnonzero(transformed_b)) == set(move_indexes)
+    assert np.array_equal(t.reverse_move_indexes(move_indexes, (3, 3)),
+                          [1, 5])
+
+
+def test_permutations_are_cached_per_transform():
+    t = Rotate90(1)
+    permutation = t.get_permutation((3, 3))
+
+    assert t.get_permutation((3, 3)) is permutation
+    assert Rotate90(1).get_permutation((3, 3)) is not permutation
+    assert len(t.get_permutation((4, 4))) == 16
+    assert set(t.permutations) == {(3, 3), (4, 4)}
+
+
+def test_get_all_orientations():
+    transforms = [Identity(), Rotate90(1), Rotate90(2), Flip(np.flipud)]
+    permutations = compile_permutations(transforms, (2, 3))
+    b = np.arange(6)
+
+    orientations = get_all_orientations(np.array([b]), permutations)
+
+    assert orientations.shape == (1, 4, 6)
+    assert np.array_equal(orientations[0, 2],
+                          np.rot90(b.reshape(2, 3), 2).flatten())
+
+    move_indexes = get_all_move_index_orientations(
+        4, invert_permutations(permutations))
+    assert np.array_equal(orientations[0, np.arange(4), move_indexes],
+                          [4, 4, 4, 4])
@@ -0,0 +1,132 @@
+import random
+import time
+
+import numpy as np
+
+from tictac.board import (Board, CELL_X, CELL_O, CELL_EMPTY, RESULT_X_WINS,
+                          RESULT_O_WINS, RESULT_DRAW, RESULT_NOT_OVER,
+                          GameResults, print_game_results)
+from tictac.geometry import STANDARD_GEOMETRY
+
+
+def play_batch_games(total_games, x_strategy, o_strategy,
+                     geometry=STANDARD_GEOMETRY):
+    move_times = np.zeros(total_games)
+    start = time.perf_counter()
+    boards, game_results = play_games_in_batch(total_games, x_strategy,
+                                               o_strategy, geometry,
+                                               move_times)
+    elapsed = time.perf_counter() - start
+
+    results = GameResults()
+    for result in [RESULT_X_WINS, RESULT_O_WINS, RESULT_DRAW]:
+        finished = game_results == result
+        num_moves = np.count_nonzero(boards[finished])
+        results.add_games(result, np.count_nonzero(finished), num_moves,
+                          move_times[finished].sum(), 0.0)
+    results.elapsed = elapsed
+
+    print_game_results(results)
+
+    return results
+
+
+def play_games_in_batch(total_games, x_strategy, o_strategy,
+                        geometry=STANDARD_GEOMETRY, move_times=None):
+    boards = np.zeros((total_games, geometry.num_cells), dtype=np.int8)
+    return play_batch(boards, x_strategy, o_strategy, geometry, move_times)
+
+
+def play_batch(boards, x_strategy, o_strategy, geometry=STANDARD_GEOMETRY,
+               move_times=None):
+    boards = np.array(boards, dtype=np.int8)
+    results = get_game_results(boards, geometry)
+
+    while True:
+        live = np.flatnonzero(results == RESULT_NOT_OVER)
+        if live.size == 0:
+            return boards, results
+
+        turns = get_turns(boards[live])
+        for turn, strategy in [(CELL_X, x_strategy), (CELL_O, o_strategy)]:
+            rows = live[turns == turn]
+            if rows.size > 0:
+                start = time.perf_counter()
+                moves = np.asarray(strategy(boards[rows], turn))
+                if move_times is not None:
+                    # one call chooses a move for every row, so each game
+                    # is charged an equal share of its time
+                    move_times[rows] += ((time.perf_counter() - start)
+                                         / rows.size)
+                results[rows] = play_moves(boards, rows, moves, turn,
+                                           geometry)
+
+
+def play_moves(boards, rows, moves, turn, geometry=STANDARD_GEOMETRY):
+    results = np.full(rows.size, RESULT_NOT_OVER, dtype=np.int8)
+
+    illegal = boards[rows, moves] != CELL_EMPTY
+    results[illegal] = RESULT_O_WINS if turn == CELL_X else RESULT_X_WINS
+
+    legal_rows = rows[~illegal]
+    boards[legal_rows, moves[~illegal]] = turn
+    results[~illegal] = get_game_results(boards[legal_rows], geometry)
+
+    return results
+
+
+def get_game_results(boards, geometry=STANDARD_GEOMETRY):
+    line_sums = boards.astype(np.int64) @ geometry.line_matrix
+    results = np.full(len(boards), RESULT_NOT_OVER, dtype=np.int8)
+
+    results[np.all(boards != CELL_EMPTY, axis=1)] = RESULT_DRAW
+    results[np.any(line_sums == -geometry.k, axis=1)] = RESULT_O_WINS
+    results[np.any(line_sums == geometry.k, axis=1)] = RESULT_X_WINS
+
+    return results
+
+
+def get_turns(boards):
+    non_zero = np.count_nonzero(boards, axis=1)
+    return np.where(non_zero % 2 == 0, CELL_X, CELL_O)
+
+
+def play_random_moves(boards, turn, rng=None):
+    rng = get_numpy_rng(rng)
+    uniform = np.random.uniform if rng is None else rng.uniform
+    priorities = uniform(size=boards.shape)
+    priorities[boards != CELL_EMPTY] = -1
+    return np.argmax(priorities, axis=1)
+
+
+def create_random_batch_player(rng=None):
+    rng = get_numpy_rng(rng)
+
+    def play(boards, turn):
+        return play_random_moves(boards, turn, rng)
+
+    return play
+
+
+def get_numpy_rng(rng):
+    # the mcts module is seeded with random.Random, whose uniform draws one
+    # number at a time, so batches draw from a numpy generator derived from it
+    if isinstance(rng, random.Random):
+        return np.random.default_rng(rng.getrandbits(64))
+    return rng
+
+
+def create_batch_player(strategy, geometry=STANDARD_GEOMETRY):
+    def play(boards, turn):
+        return [get_move_index(strategy, b, geometry) for b in boards]
+
+    return play
+
+
+def get_move_index(strategy, b, geometry=STANDARD_GEOMETRY):
+    board = Board(b, geometry=geometry)
+    updated_board = strategy(board)
+    if updated_board.is_in_illegal_state():
+        return updated_board.illegal_move
+
+    return np.flatnonzero(updated_board.board != board.board)[0]
@@ -0,0 +1,95 @@
+import numpy as np
+
+LINE_DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+def get_win_masks(rows, cols, k):
+    win_masks = []
+    for dr, dc in LINE_DIRECTIONS:
+        for r in range(rows):
+            for c in range(cols):
+                end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    win_masks.append(sum(1 << (r + dr * i) * cols + c + dc * i
+                                         for i in range(k)))
+    return win_masks
+
+
+def get_lines_through_cell(win_masks, num_cells):
+    return [[wm for wm in win_masks if wm >> i & 1] for i in range(num_cells)]
+
+
+def count_bits(mask):
+    return bin(mask).count("1")
+
+
+def get_mask_indexes(mask):
+    return tuple(i for i in range(mask.bit_length()) if mask >> i & 1)
+
+
+def is_win(bits, win_masks):
+    for wm in win_masks:
+        if bits & wm == wm:
+            return True
+    return False
+
+
+class PopCount:
+    def __getitem__(self, mask):
+        return count_bits(mask)
+
+
+class MaskIndexes:
+    def __getitem__(self, mask):
+        return get_mask_indexes(mask)
+
+
+class WinCheck:
+    def __init__(self, win_masks):
+        self.win_masks = win_masks
+
+    def __getitem__(self, bits):
+        return is_win(bits, self.win_masks)
+
+
+NUM_CELLS = 9
+FULL_MASK = (1 << NUM_CELLS) - 1
+
+WIN_MASKS = get_win_masks(3, 3, 3)
+
+LINES_THROUGH_CELL = get_lines_through_cell(WIN_MASKS, NUM_CELLS)
+
+POPCOUNT = [count_bits(mask) for mask in range(FULL_MASK + 1)]
+
+IS_WIN = [is_win(mask, WIN_MASKS) for mask in range(FULL_MASK + 1)]
+
+MASK_INDEXES = [get_mask_indexes(mask) for mask in range(FULL_MASK + 1)]
+
+
+def to_bitboards(board, cell_x, cell_o):
+    x_bits = sum(1 << int(i) for i in np.flatnonzero(board == cell_x))
+    o_bits = sum(1 << int(i) for i in np.flatnonzero(board == cell_o))
+    return x_bits, o_bits
+
+
+def is_win_through_cell(bits, index, lines_through_cell=LINES_THROUGH_CELL):
+    for wm in lines_through_cell[index]:
+        if bits & wm == wm:
+            return True
+    return False
+
+
+def is_occupied(occupied, index):
+    return occupied >> index & 1 == 1
+
+
+def get_empty_mask(occupied, full_mask=FULL_MASK):
+    return full_mask & ~occupied
+
+
+def to_position_key(x_bits, o_bits, num_cells=NUM_CELLS):
+    return x_bits | o_bits << num_cells
+
+
+def from_position_key(key, num_cells=NUM_CELLS):
+    return key & ((1 << num_cells) - 1), key >> num_cells
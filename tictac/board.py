@@ -1,14 +1,14 @@
+import time
 import random
 import itertools
 import numpy as np
 
 
-from tictac.transform import Transform, Identity, Rotate90, Flip
-
-TRANSFORMATIONS = [Identity(), Rotate90(1), Rotate90(2), Rotate90(3),
-                   Flip(np.flipud), Flip(np.fliplr),
-                   Transform(Rotate90(1), Flip(np.flipud)),
-                   Transform(Rotate90(1), Flip(np.fliplr))]
+from tictac.geometry import TRANSFORMATIONS, STANDARD_GEOMETRY
+from tictac.cache import (CacheStats, create_eviction_policy, check_geometry,
+                          get_size_in_bytes)
+from tictac.bitboard import (to_bitboards, is_occupied, get_empty_mask,
+                             is_win_through_cell)
 
 BOARD_SIZE = 3
 BOARD_DIMENSIONS = (BOARD_SIZE, BOARD_SIZE)
@@ -25,8 +25,8 @@ RESULT_NOT_OVER = 2
 new_board = np.array([CELL_EMPTY] * BOARD_SIZE ** 2)
 
 
-def play_game(x_strategy, o_strategy):
-    board = Board()
+def play_game(x_strategy, o_strategy, geometry=STANDARD_GEOMETRY):
+    board = Board(geometry=geometry)
     player_strategies = itertools.cycle([x_strategy, o_strategy])
 
     while not board.is_gameover():
@@ -37,20 +37,115 @@ def play_game(x_strategy, o_strategy):
 
 
 def play_games(total_games, x_strategy, o_strategy, play_single_game=play_game):
-    results = {
-        RESULT_X_WINS: 0,
-        RESULT_O_WINS: 0,
-        RESULT_DRAW: 0
-    }
+    results = collect_game_results(total_games, x_strategy, o_strategy,
+                                   play_single_game)
+
+    print_game_results(results)
+
+    return results
+
+
+def collect_game_results(total_games, x_strategy, o_strategy,
+                         play_single_game=play_game):
+    results = GameResults()
+
+    for outcome in iterate_games(total_games, x_strategy, o_strategy,
+                                 play_single_game):
+        results.add(outcome)
+
+    return results
 
+
+def iterate_games(total_games, x_strategy, o_strategy,
+                  play_single_game=play_game):
     for g in range(total_games):
-        end_of_game = (play_single_game(x_strategy, o_strategy))
-        result = end_of_game.get_game_result()
-        results[result] += 1
+        move_times = []
+        timed_x_strategy = create_timed_strategy(x_strategy, move_times)
+        timed_o_strategy = create_timed_strategy(o_strategy, move_times)
+
+        start = time.perf_counter()
+        end_of_game = play_single_game(timed_x_strategy, timed_o_strategy)
+        duration = time.perf_counter() - start
+
+        yield GameOutcome(end_of_game.get_game_result(), move_times, duration)
+
+
+def create_timed_strategy(strategy, move_times):
+    def play(board):
+        start = time.perf_counter()
+        updated_board = strategy(board)
+        move_times.append(time.perf_counter() - start)
+        return updated_board
+
+    return play
 
-    x_wins_percent = results[RESULT_X_WINS] / total_games * 100
-    o_wins_percent = results[RESULT_O_WINS] / total_games * 100
-    draw_percent = results[RESULT_DRAW] / total_games * 100
+
+class GameOutcome:
+    def __init__(self, result, move_times, duration):
+        self.result = result
+        self.move_times = move_times
+        self.duration = duration
+
+    def get_num_moves(self):
+        return len(self.move_times)
+
+
+class GameResults:
+    def __init__(self):
+        self.counts = {
+            RESULT_X_WINS: 0,
+            RESULT_O_WINS: 0,
+            RESULT_DRAW: 0
+        }
+        self.total_games = 0
+        self.total_moves = 0
+        self.total_move_time = 0.0
+        self.elapsed = 0.0
+
+    def add(self, outcome):
+        self.add_games(outcome.result, 1, outcome.get_num_moves(),
+                       sum(outcome.move_times), outcome.duration)
+
+    def add_games(self, result, num_games, num_moves, move_time, elapsed):
+        self.counts[result] += num_games
+        self.total_games += num_games
+        self.total_moves += num_moves
+        self.total_move_time += move_time
+        self.elapsed += elapsed
+
+    def merge(self, other):
+        for result, count in other.counts.items():
+            self.counts[result] += count
+        self.total_games += other.total_games
+        self.total_moves += other.total_moves
+        self.total_move_time += other.total_move_time
+        self.elapsed += other.elapsed
+
+    def get_percentage(self, result):
+        if self.total_games == 0:
+            return 0.0
+        return self.counts[result] / self.total_games * 100
+
+    def get_average_moves_per_game(self):
+        if self.total_games == 0:
+            return 0.0
+        return self.total_moves / self.total_games
+
+    def get_average_move_time(self):
+        if self.total_moves == 0:
+            return 0.0
+        return self.total_move_time / self.total_moves
+
+    def get_games_per_second(self):
+        if self.elapsed == 0:
+            return 0.0
+        return self.total_games / self.elapsed
+
+
+def print_game_results(results):
+    x_wins_percent = results.get_percentage(RESULT_X_WINS)
+    o_wins_percent = results.get_percentage(RESULT_O_WINS)
+    draw_percent = results.get_percentage(RESULT_DRAW)
 
     print(f"x wins: {x_wins_percent:.2f}%")
     print(f"o wins: {o_wins_percent:.2f}%")
@@ -71,33 +166,86 @@ def is_empty(values):
 
 
 class Board:
-    def __init__(self, board=None, illegal_move=None):
+    __slots__ = ("x_bits", "o_bits", "illegal_move", "geometry",
+                 "cached_board", "cached_result", "cached_valid_move_indexes",
+                 "cached_canonical_key")
+
+    def __new__(cls, board=None, illegal_move=None, geometry=None):
+        if geometry is None:
+            geometry = STANDARD_GEOMETRY
+
         if board is None:
-            self.board = np.copy(new_board)
+            x_bits, o_bits = 0, 0
         else:
-            self.board = board
+            board = np.ravel(board)
+            if board.size != geometry.num_cells:
+                raise ValueError(f"board has {board.size} cells, expected "
+                                 f"{geometry.num_cells}")
+            x_bits, o_bits = to_bitboards(board, CELL_X, CELL_O)
+
+        if illegal_move is not None:
+            return create_board(x_bits, o_bits, illegal_move, geometry)
+
+        return Board.from_bitboards(x_bits, o_bits, geometry=geometry)
+
+    @staticmethod
+    def from_bitboards(x_bits, o_bits, result=None,
+                       geometry=STANDARD_GEOMETRY):
+        key = geometry.to_position_key(x_bits, o_bits)
+        board = geometry.interned_boards.get(key)
+        if board is None:
+            board = create_board(x_bits, o_bits, None, geometry)
+            geometry.intern(key, board)
 
-        self.illegal_move = illegal_move
+        if result is not None and board.cached_result is None:
+            object.__setattr__(board, "cached_result", result)
 
-        self.board_2d = self.board.reshape(BOARD_DIMENSIONS)
+        return board
 
-    def get_game_result(self):
+    def __setattr__(self, name, value):
+        raise AttributeError("Board is immutable")
+
+    def __reduce__(self):
         if self.illegal_move is not None:
-            return RESULT_O_WINS if self.get_turn() == CELL_X else RESULT_X_WINS
+            return create_board, (self.x_bits, self.o_bits, self.illegal_move,
+                                  self.geometry)
+        return Board.from_bitboards, (self.x_bits, self.o_bits, None,
+                                      self.geometry)
+
+    @property
+    def board(self):
+        board = self.cached_board
+        if board is None:
+            mask_indexes = self.geometry.mask_indexes
+            board = np.copy(self.geometry.empty_board)
+            board[list(mask_indexes[self.x_bits])] = CELL_X
+            board[list(mask_indexes[self.o_bits])] = CELL_O
+            board.setflags(write=False)
+            object.__setattr__(self, "cached_board", board)
+        return board
+
+    @property
+    def board_2d(self):
+        return self.board.reshape(self.geometry.dimensions)
 
-        rows_cols_and_diagonals = get_rows_cols_and_diagonals(self.board_2d)
+    def get_game_result(self):
+        result = self.cached_result
+        if result is None:
+            result = self.calculate_game_result()
+            object.__setattr__(self, "cached_result", result)
+        return result
 
-        sums = list(map(sum, rows_cols_and_diagonals))
-        max_value = max(sums)
-        min_value = min(sums)
+    def calculate_game_result(self):
+        if self.illegal_move is not None:
+            return RESULT_O_WINS if self.get_turn() == CELL_X else RESULT_X_WINS
 
-        if max_value == BOARD_SIZE:
+        if self.geometry.is_win[self.x_bits]:
             return RESULT_X_WINS
 
-        if min_value == -BOARD_SIZE:
+        if self.geometry.is_win[self.o_bits]:
             return RESULT_O_WINS
 
-        if CELL_EMPTY not in self.board_2d:
+        if self.get_occupied_mask() == self.geometry.full_mask:
             return RESULT_DRAW
 
         return RESULT_NOT_OVER
@@ -109,25 +257,59 @@ class Board:
         return self.illegal_move is not None
 
     def play_move(self, move_index):
-        board_copy = np.copy(self.board)
+        if not self.is_valid_move(move_index):
+            return create_board(self.x_bits, self.o_bits, move_index,
+                                self.geometry)
+
+        turn = self.get_turn()
+
+        x_bits, o_bits = self.x_bits, self.o_bits
+        if turn == CELL_X:
+            x_bits |= 1 << int(move_index)
+        else:
+            o_bits |= 1 << int(move_index)
+
+        result = None
+        if self.get_game_result() == RESULT_NOT_OVER:
+            result = get_result_after_move(x_bits, o_bits, turn, move_index,
+                                           self.geometry)
+
+        return Board.from_bitboards(x_bits, o_bits, result, self.geometry)
 
-        if move_index not in self.get_valid_move_indexes():
-            return Board(board_copy, illegal_move=move_index)
+    def is_valid_move(self, move_index):
+        return (0 <= move_index < self.geometry.num_cells
+                and not is_occupied(self.get_occupied_mask(), move_index))
 
-        board_copy[move_index] = self.get_turn()
-        return Board(board_copy)
+    def get_position_key(self):
+        return self.geometry.to_position_key(self.x_bits, self.o_bits)
+
+    def get_canonical_key(self):
+        canonical_key = self.cached_canonical_key
+        if canonical_key is None:
+            canonical_key = self.geometry.get_canonical_key_and_transform(
+                self.x_bits, self.o_bits)
+            object.__setattr__(self, "cached_canonical_key", canonical_key)
+        return canonical_key
+
+    def get_occupied_mask(self):
+        return self.x_bits | self.o_bits
 
     def get_turn(self):
-        non_zero = np.count_nonzero(self.board)
+        non_zero = self.geometry.popcount[self.get_occupied_mask()]
         return CELL_X if is_even(non_zero) else CELL_O
 
     def get_valid_move_indexes(self):
-        return ([i for i in range(self.board.size)
-                 if self.board[i] == CELL_EMPTY])
+        valid_move_indexes = self.cached_valid_move_indexes
+        if valid_move_indexes is None:
+            empty_mask = get_empty_mask(self.get_occupied_mask(),
+                                        self.geometry.full_mask)
+            valid_move_indexes = self.geometry.mask_indexes[empty_mask]
+            object.__setattr__(self, "cached_valid_move_indexes",
+                               valid_move_indexes)
+        return list(valid_move_indexes)
 
     def get_illegal_move_indexes(self):
-        return ([i for i in range(self.board.size)
-                if self.board[i] != CELL_EMPTY])
+        return list(self.geometry.mask_indexes[self.get_occupied_mask()])
 
     def get_random_valid_move_index(self):
         return random.choice(self.get_valid_move_indexes())
@@ -137,42 +319,135 @@ class Board:
 
     def get_board_as_string(self):
         rows, cols = self.board_2d.shape
-        board_as_string = "-------\n"
+        border = "-" * (2 * cols + 1) + "\n"
+        board_as_string = border
         for r in range(rows):
             for c in range(cols):
                 move = get_symbol(self.board_2d[r, c])
                 if c == 0:
                     board_as_string += f"|{move}|"
-                elif c == 1:
+                elif c < cols - 1:
                     board_as_string += f"{move}|"
                 else:
                     board_as_string += f"{move}|\n"
-        board_as_string += "-------\n"
+        board_as_string += border
 
         return board_as_string
 
 
 class BoardCache:
-    def __init__(self):
+    def __init__(self, capacity=None, eviction="lru", fallback=None):
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"cache capacity must be positive, got {capacity}")
+
+        self.capacity = capacity
+        self.eviction_policy = eviction
+        self.fallback = fallback
+        self.geometry = None
         self.cache = {}
+        self.orientations = {}
+        self.eviction = (create_eviction_policy(eviction)
+                         if capacity is not None else None)
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self.cache)
 
     def set_for_position(self, board, o):
-        self.cache[board.board_2d.tobytes()] = o
+        if board.geometry is not self.geometry:
+            check_geometry(self, board.geometry)
+        key, transform_index = board.get_canonical_key()
+        if self.eviction is not None:
+            if key in self.cache:
+                self.eviction.touch(key)
+            else:
+                if len(self.cache) >= self.capacity:
+                    self.evict()
+                self.eviction.add(key)
+        self.cache[key] = o
+        self.orientations[key] = transform_index
 
     def get_for_position(self, board):
-        board_2d = board.board_2d
+        if board.geometry is not self.geometry:
+            check_geometry(self, board.geometry)
+        key, transform_index = board.get_canonical_key()
+
+        result = self.cache.get(key)
+        if result is not None:
+            stored_transform_index = self.orientations[key]
+            to_stored_orientation = board.geometry.to_stored_orientation
+            symmetry = to_stored_orientation[transform_index][
+                stored_transform_index]
+            self.stats.hits += 1
+            self.stats.symmetry_hits[symmetry] += 1
+            if self.eviction is not None:
+                self.eviction.touch(key)
+            return (result, TRANSFORMATIONS[symmetry]), True
+
+        self.stats.misses += 1
+        if self.fallback is not None:
+            return self.fallback.get_for_position(board)
+        return None, False
 
-        orientations = get_symmetrical_board_orientations(board_2d)
+    def evict(self):
+        key = self.eviction.pop_victim()
+        del self.cache[key]
+        del self.orientations[key]
+        self.stats.evictions += 1
 
-        for b, t in orientations:
-            result = self.cache.get(b.tobytes())
-            if result is not None:
-                return (result, t), True
+    def get_num_entries(self):
+        return len(self.cache)
 
-        return None, False
+    def get_size_in_bytes(self):
+        return get_size_in_bytes(self.cache, self.orientations)
 
     def reset(self):
+        self.geometry = None
         self.cache = {}
+        self.orientations = {}
+        self.eviction = (create_eviction_policy(self.eviction_policy)
+                         if self.capacity is not None else None)
+        self.stats = CacheStats()
+
+
+def get_result_after_move(x_bits, o_bits, turn, move_index,
+                          geometry=STANDARD_GEOMETRY):
+    lines_through_cell = geometry.lines_through_cell
+
+    if turn == CELL_X and is_win_through_cell(x_bits, move_index,
+                                              lines_through_cell):
+        return RESULT_X_WINS
+
+    if turn == CELL_O and is_win_through_cell(o_bits, move_index,
+                                              lines_through_cell):
+        return RESULT_O_WINS
+
+    if x_bits | o_bits == geometry.full_mask:
+        return RESULT_DRAW
+
+    return RESULT_NOT_OVER
+
+
+def create_board(x_bits, o_bits, illegal_move, geometry=STANDARD_GEOMETRY):
+    board = object.__new__(Board)
+    for name, value in [("x_bits", x_bits), ("o_bits", o_bits),
+                        ("illegal_move", illegal_move),
+                        ("geometry", geometry), ("cached_board", None),
+                        ("cached_result", None),
+                        ("cached_valid_move_indexes", None),
+                        ("cached_canonical_key", None)]:
+        object.__setattr__(board, name, value)
+    return board
+
+
+def board_from_position_key(key, geometry=STANDARD_GEOMETRY):
+    x_bits, o_bits = geometry.from_position_key(key)
+    return Board.from_bitboards(x_bits, o_bits, geometry=geometry)
+
+
+def get_canonical_key_and_transform(x_bits, o_bits,
+                                    geometry=STANDARD_GEOMETRY):
+    return geometry.get_canonical_key_and_transform(x_bits, o_bits)
 
 
 def get_symmetrical_board_orientations(board_2d):
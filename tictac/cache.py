@@ -0,0 +1,332 @@
+import os
+import sys
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+from tictac.geometry import TRANSFORMATIONS, get_geometry
+
+
+class LRUEviction:
+    def __init__(self):
+        self.keys = OrderedDict()
+
+    def add(self, key):
+        self.keys[key] = None
+
+    def touch(self, key):
+        self.keys.move_to_end(key)
+
+    def remove(self, key):
+        del self.keys[key]
+
+    def pop_victim(self):
+        key, _ = self.keys.popitem(last=False)
+        return key
+
+
+class LFUEviction:
+    def __init__(self):
+        self.counts = {}
+        self.keys_by_count = defaultdict(OrderedDict)
+        self.min_count = 0
+
+    def add(self, key):
+        self.counts[key] = 1
+        self.keys_by_count[1][key] = None
+        self.min_count = 1
+
+    def touch(self, key):
+        count = self.counts[key]
+        self.unlink(key, count)
+        self.counts[key] = count + 1
+        self.keys_by_count[count + 1][key] = None
+        if self.min_count == count and count not in self.keys_by_count:
+            self.min_count = count + 1
+
+    def remove(self, key):
+        count = self.counts.pop(key)
+        self.unlink(key, count)
+        if self.min_count == count and count not in self.keys_by_count:
+            self.min_count = min(self.keys_by_count, default=0)
+
+    def pop_victim(self):
+        key = next(iter(self.keys_by_count[self.min_count]))
+        self.remove(key)
+        return key
+
+    def unlink(self, key, count):
+        keys = self.keys_by_count[count]
+        del keys[key]
+        if not keys:
+            del self.keys_by_count[count]
+
+
+EVICTION_POLICIES = {"lru": LRUEviction, "lfu": LFUEviction}
+
+MAX_MAPPED_KEY = (1 << 64) - 1
+
+# cached values are plain numbers or tuples such as the (value, bound) pairs
+# of the minimax engine, saved as one column per tuple item
+VALUE_FIELDS = [("value", None), ("bound", np.int8), ("depth", np.int16)]
+
+SHARED_ENTRY_DTYPE = np.dtype([("key_hash", np.uint64),
+                               ("verification", np.uint32),
+                               ("value", np.float64), ("bound", np.int8),
+                               ("depth", np.int16), ("checksum", np.uint64)])
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+VERIFICATION_MULTIPLIER = 0xC2B2AE3D27D4EB4F
+CHECKSUM_SALT = 0x5BD1E9955BD1E995
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.symmetry_hits = [0] * len(TRANSFORMATIONS)
+
+    def get_lookups(self):
+        return self.hits + self.misses
+
+    def get_hit_rate(self):
+        lookups = self.get_lookups()
+        return self.hits / lookups if lookups > 0 else 0.0
+
+    def get_symmetry_hit_rates(self):
+        return [count / self.hits if self.hits > 0 else 0.0
+                for count in self.symmetry_hits]
+
+
+def create_eviction_policy(eviction):
+    if callable(eviction):
+        return eviction()
+    if eviction not in EVICTION_POLICIES:
+        raise ValueError(f"unknown eviction policy {eviction!r}")
+    return EVICTION_POLICIES[eviction]()
+
+
+def check_geometry(cache, geometry):
+    # keys are canonical positions of one board size, so a cache serves the
+    # geometry it first sees and refuses the others
+    if cache.geometry is None:
+        cache.geometry = geometry
+    elif geometry is not cache.geometry:
+        raise ValueError(f"cache holds {describe_geometry(cache.geometry)} "
+                         f"positions, got {describe_geometry(geometry)}")
+
+
+def describe_geometry(geometry):
+    return f"{geometry.rows}x{geometry.cols} k={geometry.k}"
+
+
+def get_size_in_bytes(*dicts):
+    return sum(sys.getsizeof(d) + sum(sys.getsizeof(k) + sys.getsizeof(v)
+                                      for k, v in d.items())
+               for d in dicts)
+
+
+class MappedBoardCache:
+    def __init__(self, path):
+        self.path = path
+        self.entries = np.load(path, mmap_mode="r")
+        self.keys = self.entries["key"]
+        self.value_fields = [name for name, _ in VALUE_FIELDS
+                             if name in self.entries.dtype.names]
+        self.geometry = load_geometry(get_geometry_path(path))
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def set_for_position(self, board, o):
+        raise ValueError(f"board cache {self.path} is read-only")
+
+    def get_for_position(self, board):
+        if board.geometry is not self.geometry:
+            check_geometry(self, board.geometry)
+        key, transform_index = board.get_canonical_key()
+
+        i = find_key(self.keys, key)
+        if i is not None:
+            entry = self.entries[i]
+            to_stored_orientation = board.geometry.to_stored_orientation
+            symmetry = to_stored_orientation[transform_index][
+                int(entry["orientation"])]
+            self.stats.hits += 1
+            self.stats.symmetry_hits[symmetry] += 1
+            return (get_entry_value(entry, self.value_fields),
+                    TRANSFORMATIONS[symmetry]), True
+
+        self.stats.misses += 1
+        return None, False
+
+    def get_num_entries(self):
+        return len(self.entries)
+
+    def get_size_in_bytes(self):
+        return self.entries.nbytes
+
+
+def find_key(keys, key):
+    if key > MAX_MAPPED_KEY:
+        return None
+    key = np.uint64(key)
+    i = int(np.searchsorted(keys, key))
+    if i < len(keys) and keys[i] == key:
+        return i
+    return None
+
+
+def get_entry_value(entry, value_fields):
+    if len(value_fields) == 1:
+        return entry["value"].item()
+    return tuple(entry[name].item() for name in value_fields)
+
+
+def get_entry_dtype(value_dtype=np.float64, num_value_fields=1):
+    return np.dtype([("key", np.uint64), ("orientation", np.int8)]
+                    + [(name, value_dtype if dtype is None else dtype)
+                       for name, dtype in VALUE_FIELDS[:num_value_fields]])
+
+
+def get_num_value_fields(values):
+    if not values or not isinstance(values[0], tuple):
+        return 1
+    if len(values[0]) > len(VALUE_FIELDS):
+        raise ValueError(f"cannot save {len(values[0])}-tuple values")
+    return len(values[0])
+
+
+def save_board_cache(board_cache, path, value_dtype=np.float64):
+    keys = sorted(board_cache.cache)
+    if keys and keys[-1] > MAX_MAPPED_KEY:
+        raise ValueError("position keys do not fit in 64 bits")
+
+    values = [board_cache.cache[k] for k in keys]
+    num_value_fields = get_num_value_fields(values)
+    entries = np.empty(len(keys),
+                       dtype=get_entry_dtype(value_dtype, num_value_fields))
+    entries["key"] = keys
+    entries["orientation"] = [board_cache.orientations[k] for k in keys]
+    if num_value_fields == 1:
+        entries["value"] = values
+    else:
+        for i, (name, _) in enumerate(VALUE_FIELDS[:num_value_fields]):
+            entries[name] = [value[i] for value in values]
+
+    save_geometry(board_cache.geometry, get_geometry_path(path))
+    save_array(entries, path)
+
+
+def load_board_cache(path):
+    return MappedBoardCache(path)
+
+
+def get_geometry_path(path):
+    return f"{path}.geometry.npy"
+
+
+def save_geometry(geometry, path):
+    shape = [] if geometry is None else [geometry.rows, geometry.cols,
+                                         geometry.k]
+    save_array(np.array(shape, dtype=np.int64), path)
+
+
+def load_geometry(path):
+    shape = np.load(path).tolist()
+    return get_geometry(*shape) if shape else None
+
+
+def save_array(array, path):
+    # write to a temporary file first so readers never map a partial file
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(temp_path, path)
+
+
+class SharedTranspositionTable:
+    def __init__(self, capacity, name=None):
+        # shared_memory needs python 3.8, so only the parallel search needs it
+        from multiprocessing import shared_memory
+
+        self.capacity = capacity
+        self.owner = name is None
+        self.shared_memory = shared_memory.SharedMemory(
+            name=name, create=self.owner,
+            size=capacity * SHARED_ENTRY_DTYPE.itemsize)
+        self.entries = np.ndarray(capacity, dtype=SHARED_ENTRY_DTYPE,
+                                  buffer=self.shared_memory.buf)
+        if self.owner:
+            self.clear()
+        self.stats = CacheStats()
+
+    def __reduce__(self):
+        return SharedTranspositionTable, (self.capacity,
+                                          self.shared_memory.name)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.entries["checksum"]))
+
+    def set_for_position(self, board, o):
+        key, _ = board.get_canonical_key()
+        key_hash, verification = hash_key(key)
+        value, bound, depth = o
+        self.entries[key_hash % self.capacity] = (
+            key_hash, verification, value, bound, depth,
+            get_checksum(key_hash, verification, value, bound, depth))
+
+    def get_for_position(self, board):
+        key, _ = board.get_canonical_key()
+        key_hash, verification = hash_key(key)
+
+        # entries are written without locks, so a reader can see one that
+        # is half written. the checksum covers every field and rejects those
+        (entry_key_hash, entry_verification, value, bound, depth,
+         checksum) = self.entries[key_hash % self.capacity].item()
+        if (entry_key_hash == key_hash
+                and entry_verification == verification
+                and checksum == get_checksum(key_hash, verification, value,
+                                             bound, depth)):
+            self.stats.hits += 1
+            return ((value, bound, depth), None), True
+
+        self.stats.misses += 1
+        return None, False
+
+    def get_num_entries(self):
+        return len(self)
+
+    def get_size_in_bytes(self):
+        return self.entries.nbytes
+
+    def clear(self):
+        self.entries[:] = 0
+
+    def release(self):
+        self.entries = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+
+def hash_key(key):
+    # keys of large boards are wider than 64 bits, so they are folded into a
+    # 64-bit hash for the slot and a second 32-bit hash to verify a match
+    key_hash = 0
+    verification = 0
+    while True:
+        word = key & MAX_MAPPED_KEY
+        key_hash = (key_hash ^ word) * FIBONACCI_MULTIPLIER & MAX_MAPPED_KEY
+        verification = ((verification ^ word) * VERIFICATION_MULTIPLIER
+                        & MAX_MAPPED_KEY)
+        key >>= 64
+        if not key:
+            return key_hash, verification >> 32
+
+
+def get_checksum(key_hash, verification, value, bound, depth):
+    value_bits = int(np.float64(value).view(np.uint64))
+    return (key_hash ^ verification ^ value_bits ^ bound << 56 ^ depth << 40
+            ^ CHECKSUM_SALT) & MAX_MAPPED_KEY
@@ -0,0 +1,143 @@
+import numpy as np
+
+from tictac.transform import (Transform, Identity, Rotate90, Flip,
+                              compile_permutations, invert_permutations)
+from tictac.bitboard import (get_win_masks, get_lines_through_cell,
+                             count_bits, get_mask_indexes, is_win, PopCount,
+                             MaskIndexes, WinCheck)
+
+TRANSFORMATIONS = [Identity(), Rotate90(1), Rotate90(2), Rotate90(3),
+                   Flip(np.flipud), Flip(np.fliplr),
+                   Transform(Rotate90(1), Flip(np.flipud)),
+                   Transform(Rotate90(1), Flip(np.fliplr))]
+
+# rotating a rectangular board by 90 degrees changes its shape, so only the
+# identity, the 180 degree rotation and the two flips are symmetries
+SQUARE_TRANSFORM_INDEXES = [0, 1, 2, 3, 4, 5, 6, 7]
+RECTANGLE_TRANSFORM_INDEXES = [0, 2, 4, 5]
+
+MAX_TABLE_CELLS = 12
+CHUNK_BITS = 8
+MAX_INTERNED_BOARDS = 2 ** 20
+
+geometries = {}
+
+
+class BoardGeometry:
+    def __init__(self, rows, cols, k):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.dimensions = (rows, cols)
+        self.num_cells = rows * cols
+        self.full_mask = (1 << self.num_cells) - 1
+
+        self.win_masks = get_win_masks(rows, cols, k)
+        self.lines_through_cell = get_lines_through_cell(self.win_masks,
+                                                         self.num_cells)
+        self.line_matrix = np.array([[wm >> i & 1 for wm in self.win_masks]
+                                     for i in range(self.num_cells)],
+                                    dtype=np.int8)
+
+        if self.num_cells <= MAX_TABLE_CELLS:
+            masks = range(self.full_mask + 1)
+            self.popcount = [count_bits(mask) for mask in masks]
+            self.is_win = [is_win(mask, self.win_masks) for mask in masks]
+            self.mask_indexes = [get_mask_indexes(mask) for mask in masks]
+        else:
+            self.popcount = PopCount()
+            self.is_win = WinCheck(self.win_masks)
+            self.mask_indexes = MaskIndexes()
+
+        self.transform_indexes = (SQUARE_TRANSFORM_INDEXES if rows == cols
+                                  else RECTANGLE_TRANSFORM_INDEXES)
+        self.symmetry_permutations = {
+            i: TRANSFORMATIONS[i].get_permutation(self.dimensions)
+            for i in self.transform_indexes}
+        self.symmetry_permutation_matrix = compile_permutations(
+            [TRANSFORMATIONS[i] for i in self.transform_indexes],
+            self.dimensions)
+        self.symmetry_inverse_permutation_matrix = invert_permutations(
+            self.symmetry_permutation_matrix)
+
+        self.chunk_bits = (self.num_cells if self.num_cells <= MAX_TABLE_CELLS
+                           else CHUNK_BITS)
+        self.symmetry_tables = {
+            i: create_chunk_tables(p, self.chunk_bits)
+            for i, p in self.symmetry_permutations.items()}
+
+        # to_stored_orientation[q][s] is the transform taking a board that
+        # maps to its canonical orientation with transform q onto the stored
+        # orientation of the same position, which maps to canonical with s
+        self.to_stored_orientation = {
+            q: {s: self.find_transform_index(pq[np.argsort(ps)])
+                for s, ps in self.symmetry_permutations.items()}
+            for q, pq in self.symmetry_permutations.items()}
+
+        self.empty_board = np.zeros(self.num_cells, dtype=int)
+        self.interned_boards = {}
+
+    def __reduce__(self):
+        return get_geometry, (self.rows, self.cols, self.k)
+
+    def to_position_key(self, x_bits, o_bits):
+        return x_bits | o_bits << self.num_cells
+
+    def from_position_key(self, key):
+        return key & self.full_mask, key >> self.num_cells
+
+    def permute_mask(self, mask, transform_index):
+        chunk_mask = (1 << self.chunk_bits) - 1
+        permuted = 0
+        for table in self.symmetry_tables[transform_index]:
+            permuted |= table[mask & chunk_mask]
+            mask >>= self.chunk_bits
+        return permuted
+
+    def get_canonical_key_and_transform(self, x_bits, o_bits):
+        return min((self.to_position_key(self.permute_mask(x_bits, i),
+                                         self.permute_mask(o_bits, i)), i)
+                   for i in self.transform_indexes)
+
+    def find_transform_index(self, permutation):
+        for i, p in self.symmetry_permutations.items():
+            if np.array_equal(p, permutation):
+                return i
+        raise ValueError("permutation is not a board symmetry")
+
+    def intern(self, key, board):
+        if len(self.interned_boards) >= MAX_INTERNED_BOARDS:
+            self.interned_boards = {}
+        self.interned_boards[key] = board
+
+
+def create_chunk_tables(permutation, chunk_bits):
+    destinations = np.argsort(permutation)
+    tables = []
+    for start in range(0, len(permutation), chunk_bits):
+        chunk_destinations = destinations[start:start + chunk_bits]
+        table = [0] * (1 << len(chunk_destinations))
+        for value in range(1, len(table)):
+            lowest_bit = (value & -value).bit_length() - 1
+            table[value] = (table[value & (value - 1)]
+                            | 1 << int(chunk_destinations[lowest_bit]))
+        tables.append(table)
+    return tables
+
+
+def get_geometry(rows=3, cols=None, k=None):
+    if cols is None:
+        cols = rows
+    if k is None:
+        k = min(rows, cols)
+    if not 1 <= k <= max(rows, cols):
+        raise ValueError(f"cannot get {k} in a row on a {rows}x{cols} board")
+
+    geometry = geometries.get((rows, cols, k))
+    if geometry is None:
+        geometry = BoardGeometry(rows, cols, k)
+        geometries[(rows, cols, k)] = geometry
+    return geometry
+
+
+STANDARD_GEOMETRY = get_geometry(3, 3, 3)
@@ -1,47 +1,56 @@
-from tictac.board import play_games
 from tictac.board import play_random_move
+from tictac.batch import (play_batch_games, play_random_moves,
+                          create_batch_player)
 from tictac.minimax import create_minimax_player
 from tictac.qtable import (qtables, play_training_games_x,
-                           play_training_games_o, create_q_table_player)
+                           play_training_games_o, create_q_table_batch_player)
 
 from tictac.mcts import play_mcts_move, perform_training_playouts
 
-# from tictac.mcts import (play_game_and_reset_playouts,
-#                          play_mcts_move_with_live_playouts)
+# from tictac.parallel import play_games_in_parallel
+# from tictac.mcts import MCTSTree, create_live_mcts_player
 
 play_minimax_move_randomized = create_minimax_player(True)
 play_minimax_move_not_randomized = create_minimax_player(False)
 
+play_minimax_moves_randomized = create_batch_player(
+    play_minimax_move_randomized)
+play_minimax_moves_not_randomized = create_batch_player(
+    play_minimax_move_not_randomized)
+
 print("Playing random vs random:")
 print("-------------------------")
-play_games(1000, play_random_move, play_random_move)
+play_batch_games(1000, play_random_moves, play_random_moves)
 print("")
 
 print("Playing minimax not random vs minimax random:")
 print("---------------------------------------------")
-play_games(1000, play_minimax_move_not_randomized, play_minimax_move_randomized)
+play_batch_games(1000, play_minimax_moves_not_randomized,
+                 play_minimax_moves_randomized)
 print("")
 print("Playing minimax random vs minimax not random:")
 print("---------------------------------------------")
-play_games(1000, play_minimax_move_randomized, play_minimax_move_not_randomized)
+play_batch_games(1000, play_minimax_moves_randomized,
+                 play_minimax_moves_not_randomized)
 print("")
 print("Playing minimax not random vs minimax not random:")
 print("-------------------------------------------------")
-play_games(1000, play_minimax_move_not_randomized,
-           play_minimax_move_not_randomized)
+play_batch_games(1000, play_minimax_moves_not_randomized,
+                 play_minimax_moves_not_randomized)
 print("")
 print("Playing minimax random vs minimax random:")
 print("-----------------------------------------")
-play_games(1000, play_minimax_move_randomized, play_minimax_move_randomized)
+play_batch_games(1000, play_minimax_moves_randomized,
+                 play_minimax_moves_randomized)
 print("")
 
 print("Playing minimax random vs random:")
 print("---------------------------------")
-play_games(1000, play_minimax_move_randomized, play_random_move)
+play_batch_games(1000, play_minimax_moves_randomized, play_random_moves)
 print("")
 print("Playing random vs minimax random:")
 print("---------------------------------")
-play_games(1000, play_random_move, play_minimax_move_randomized)
+play_batch_games(1000, play_random_moves, play_minimax_moves_randomized)
 print("")
 
 print("Training qtable X vs. random...")
@@ -52,107 +61,108 @@ play_training_games_o(q_tables=qtables,
                       x_strategies=[play_random_move])
 print("")
 
-play_q_table_move = create_q_table_player(qtables)
+play_q_table_moves = create_q_table_batch_player(qtables)
 print("Playing qtable vs random:")
 print("-------------------------")
-play_games(1000, play_q_table_move, play_random_move)
+play_batch_games(1000, play_q_table_moves, play_random_moves)
 print("")
 print("Playing qtable vs minimax random:")
 print("---------------------------------")
-play_games(1000, play_q_table_move, play_minimax_move_randomized)
+play_batch_games(1000, play_q_table_moves, play_minimax_moves_randomized)
 print("")
 print("Playing qtable vs minimax:")
 print("--------------------------")
-play_games(1000, play_q_table_move, play_minimax_move_not_randomized)
+play_batch_games(1000, play_q_table_moves, play_minimax_moves_not_randomized)
 print("")
 
 print("Playing random vs qtable:")
 print("-------------------------")
-play_games(1000, play_random_move, play_q_table_move)
+play_batch_games(1000, play_random_moves, play_q_table_moves)
 print("")
 print("Playing minimax random vs qtable:")
 print("---------------------------------")
-play_games(1000, play_minimax_move_randomized, play_q_table_move)
+play_batch_games(1000, play_minimax_moves_randomized, play_q_table_moves)
 print("")
 print("Playing minimax vs qtable:")
 print("--------------------------")
-play_games(1000, play_minimax_move_not_randomized, play_q_table_move)
+play_batch_games(1000, play_minimax_moves_not_randomized, play_q_table_moves)
 print("")
 
 print("Playing qtable vs qtable:")
 print("-------------------------")
-play_games(1000, play_q_table_move, play_q_table_move)
+play_batch_games(1000, play_q_table_moves, play_q_table_moves)
 print("")
 print(f"number of items in qtable = {len(qtables[0].qtable.cache)}")
 print("")
 
 print("Training MCTS...")
 perform_training_playouts()
+play_mcts_moves = create_batch_player(play_mcts_move)
 print("")
 print("Playing random vs MCTS:")
 print("-----------------------")
-play_games(1000, play_random_move, play_mcts_move)
+play_batch_games(1000, play_random_moves, play_mcts_moves)
 print("")
 print("Playing minimax vs MCTS:")
 print("------------------------")
-play_games(1000, play_minimax_move_not_randomized, play_mcts_move)
+play_batch_games(1000, play_minimax_moves_not_randomized, play_mcts_moves)
 print("")
 print("Playing minimax random vs MCTS:")
 print("-------------------------------")
-play_games(1000, play_minimax_move_randomized, play_mcts_move)
+play_batch_games(1000, play_minimax_moves_randomized, play_mcts_moves)
 print("")
 print("Playing MCTS vs random:")
 print("-----------------------")
-play_games(1000, play_mcts_move, play_random_move)
+play_batch_games(1000, play_mcts_moves, play_random_moves)
 print("")
 print("Playing MCTS vs minimax:")
 print("------------------------")
-play_games(1000, play_mcts_move, play_minimax_move_not_randomized)
+play_batch_games(1000, play_mcts_moves, play_minimax_moves_not_randomized)
 print("")
 print("Playing MCTS vs minimax random:")
 print("-------------------------------")
-play_games(1000, play_mcts_move, play_minimax_move_randomized)
+play_batch_games(1000, play_mcts_moves, play_minimax_moves_randomized)
 print("")
 print("Playing MCTS vs MCTS:")
 print("---------------------")
-play_games(1000, play_mcts_move, play_mcts_move)
+play_batch_games(1000, play_mcts_moves, play_mcts_moves)
 print("")
 
-# You can uncomment the code below to run MCTS in online mode
-# print("Running MCTS in online mode, but may take a while...")
+# You can uncomment the code below to run MCTS in online mode, with a budget
+# of 20 milliseconds of playouts per move. The tree is kept between moves and
+# games, and pruned to the part reachable from the current position once it
+# holds more than 100000 nodes
+# play_mcts_move_with_live_playouts = create_live_mcts_player(
+#     time_limit_ms=20, node_cache=MCTSTree(max_nodes=100000))
+# print("Running MCTS in online mode...")
 # print("")
 # print("Playing random vs MCTS:")
 # print("-----------------------")
-# play_games(100, play_random_move, play_mcts_move_with_live_playouts,
-#            play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_random_move, play_mcts_move_with_live_playouts)
 # print("")
 # print("Playing minimax vs MCTS:")
 # print("------------------------")
-# play_games(100, play_minimax_move_not_randomized,
-#            play_mcts_move_with_live_playouts, play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_minimax_move_not_randomized,
+#                        play_mcts_move_with_live_playouts)
 # print("")
 # print("Playing minimax random vs MCTS:")
 # print("-------------------------------")
-# play_games(100, play_minimax_move_randomized, play_mcts_move_with_live_playouts,
-#            play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_minimax_move_randomized, play_mcts_move_with_live_playouts)
 # print("")
 # print("Playing MCTS vs random:")
 # print("-----------------------")
-# play_games(100, play_mcts_move_with_live_playouts, play_random_move,
-#            play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_mcts_move_with_live_playouts, play_random_move)
 # print("")
 # print("Playing MCTS vs minimax:")
 # print("------------------------")
-# play_games(100, play_mcts_move_with_live_playouts, play_minimax_move_not_randomized,
-#            play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_mcts_move_with_live_playouts, play_minimax_move_not_randomized)
 # print("")
 # print("Playing MCTS vs minimax random:")
 # print("-------------------------------")
-# play_games(100, play_mcts_move_with_live_playouts, play_minimax_move_randomized,
-#            play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_mcts_move_with_live_playouts, play_minimax_move_randomized)
 # print("")
 # print("Playing MCTS vs MCTS:")
 # print("---------------------")
-# play_games(100, play_mcts_move_with_live_playouts,
-#            play_mcts_move_with_live_playouts, play_game_and_reset_playouts)
+# play_games_in_parallel(100, play_mcts_move_with_live_playouts,
+#                        play_mcts_move_with_live_playouts)
 # print("")
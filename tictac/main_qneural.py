@@ -3,14 +3,18 @@ import numpy as np
 import torch
 from torch.nn import MSELoss
 
-from tictac.board import play_random_move, play_games, Board
+from tictac.board import play_random_move, Board
+from tictac.batch import (play_batch_games, play_random_moves,
+                          create_batch_player)
 from tictac.minimax import create_minimax_player
-from tictac.qneural import (TicTacNet, NetContext, create_qneural_player,
+from tictac.qneural import (TicTacNet, NetContext, create_qneural_batch_player,
                             get_q_values, play_training_games_x,
                             play_training_games_o)
 
-play_minimax_move_randomized = create_minimax_player(True)
-play_minimax_move_not_randomized = create_minimax_player(False)
+play_minimax_moves_randomized = create_batch_player(
+    create_minimax_player(True))
+play_minimax_moves_not_randomized = create_batch_player(
+    create_minimax_player(False))
 
 
 policy_net = TicTacNet()
@@ -34,37 +38,39 @@ play_training_games_o(net_context=net_context,
 print("")
 
 with torch.no_grad():
-    play_qneural_move = create_qneural_player(net_context)
+    play_qneural_moves = create_qneural_batch_player(net_context)
 
     print("Playing qneural vs random:")
     print("--------------------------")
-    play_games(1000, play_qneural_move, play_random_move)
+    play_batch_games(1000, play_qneural_moves, play_random_moves)
     print("")
     print("Playing qneural vs minimax random:")
     print("----------------------------------")
-    play_games(1000, play_qneural_move, play_minimax_move_randomized)
+    play_batch_games(1000, play_qneural_moves, play_minimax_moves_randomized)
     print("")
     print("Playing qneural vs minimax:")
     print("---------------------------")
-    play_games(1000, play_qneural_move, play_minimax_move_not_randomized)
+    play_batch_games(1000, play_qneural_moves,
+                     play_minimax_moves_not_randomized)
     print("")
 
     print("Playing random vs qneural:")
     print("--------------------------")
-    play_games(1000, play_random_move, play_qneural_move)
+    play_batch_games(1000, play_random_moves, play_qneural_moves)
     print("")
     print("Playing minimax random vs qneural:")
     print("----------------------------------")
-    play_games(1000, play_minimax_move_randomized, play_qneural_move)
+    play_batch_games(1000, play_minimax_moves_randomized, play_qneural_moves)
     print("")
     print("Playing minimax vs qneural:")
     print("---------------------------")
-    play_games(1000, play_minimax_move_not_randomized, play_qneural_move)
+    play_batch_games(1000, play_minimax_moves_not_randomized,
+                     play_qneural_moves)
     print("")
 
     print("Playing qneural vs qneural:")
     print("---------------------------")
-    play_games(1000, play_qneural_move, play_qneural_move)
+    play_batch_games(1000, play_qneural_moves, play_qneural_moves)
     print("")
 
     board = Board(np.array([1, -1, -1, 0, 1, 1, 0, 0, -1]))
@@ -1,29 +1,361 @@
+import os
 import math
+import time
+
+import numpy as np
 
 from tictac.board import play_game
-from tictac.board import (Board, BoardCache, CELL_X, CELL_O, RESULT_X_WINS,
+from tictac.batch import play_batch, create_random_batch_player
+from tictac.cache import (find_key, check_geometry, save_array,
+                          save_geometry, load_geometry, MAX_MAPPED_KEY)
+from tictac.board import (Board, CELL_X, CELL_O, RESULT_X_WINS,
                           RESULT_O_WINS, is_draw)
 
-nodecache = BoardCache()
+INITIAL_TREE_CAPACITY = 1024
+
+ROLLOUTS_PER_LEAF = 16
+
+LIVE_PLAYOUTS = 200
+
+NO_EDGE = -1
+
+NODE_FIELDS = [("visits", np.int64, 0), ("wins", np.int64, 0),
+               ("draws", np.int64, 0), ("losses", np.int64, 0),
+               ("parent_visits", np.int64, 0), ("root_visits", np.int64, 0),
+               ("first_parent_edges", np.int32, NO_EDGE),
+               ("first_child_edges", np.int32, NO_EDGE)]
+
+EDGE_FIELDS = [("edge_parents", np.int32, 0), ("edge_children", np.int32, 0),
+               ("next_parent_edges", np.int32, NO_EDGE),
+               ("next_child_edges", np.int32, NO_EDGE)]
+
+NODE_DTYPE = np.dtype([("key", np.uint64)]
+                      + [(name, dtype) for name, dtype, _ in NODE_FIELDS])
+EDGE_DTYPE = np.dtype([(name, dtype) for name, dtype, _ in EDGE_FIELDS])
+
+NODES_FILE = "nodes.npy"
+EDGES_FILE = "edges.npy"
+GEOMETRY_FILE = "geometry.npy"
+
+
+class MCTSTree:
+    def __init__(self, capacity=INITIAL_TREE_CAPACITY, max_nodes=None):
+        self.capacity = capacity
+        self.max_nodes = max_nodes
+        self.reset()
+
+    def __len__(self):
+        return self.num_nodes
+
+    def reset(self):
+        self.geometry = None
+        self.node_ids = {}
+        self.edge_ids = {}
+        self.num_nodes = 0
+        self.num_edges = 0
+        self.mapped_keys = None
+        self.num_mapped_nodes = 0
+        allocate(self, NODE_FIELDS, self.capacity)
+        allocate(self, EDGE_FIELDS, self.capacity)
+
+    def find_node_id(self, board):
+        if board.geometry is not self.geometry:
+            check_geometry(self, board.geometry)
+        key, _ = board.get_canonical_key()
+        return self.find_node_id_for_key(key)
+
+    def find_node_id_for_key(self, key):
+        node_id = self.node_ids.get(key)
+        if node_id is None and self.mapped_keys is not None:
+            # nodes of a loaded tree are indexed on first use
+            node_id = find_key(self.mapped_keys, key)
+            if node_id is not None:
+                self.node_ids[key] = node_id
+        return node_id
+
+    def find_or_create_node_id(self, board):
+        if board.geometry is not self.geometry:
+            check_geometry(self, board.geometry)
+        key, _ = board.get_canonical_key()
+        return self.find_or_create_node_id_for_key(key)
+
+    def find_or_create_node_id_for_key(self, key):
+        node_id = self.find_node_id_for_key(key)
+        if node_id is None:
+            node_id = self.num_nodes
+            if node_id == len(self.visits):
+                grow(self, NODE_FIELDS, node_id)
+            self.node_ids[key] = node_id
+            self.num_nodes += 1
+        return node_id
+
+    def add_edge(self, parent_id, child_id):
+        if (parent_id, child_id) in self.edge_ids:
+            return
+
+        if parent_id < self.num_mapped_nodes:
+            edge_id = self.find_edge_id(parent_id, child_id)
+            if edge_id is not None:
+                self.edge_ids[(parent_id, child_id)] = edge_id
+                return
+
+        edge_id = self.num_edges
+        if edge_id == len(self.edge_parents):
+            grow(self, EDGE_FIELDS, edge_id)
+        self.edge_ids[(parent_id, child_id)] = edge_id
+        self.num_edges += 1
+
+        self.edge_parents[edge_id] = parent_id
+        self.edge_children[edge_id] = child_id
+        self.next_parent_edges[edge_id] = self.first_parent_edges[child_id]
+        self.first_parent_edges[child_id] = edge_id
+        self.next_child_edges[edge_id] = self.first_child_edges[parent_id]
+        self.first_child_edges[parent_id] = edge_id
+
+        self.parent_visits[child_id] += self.visits[parent_id]
+
+    def add_visits(self, node_id, count=1):
+        # keep the parent visit total n(s) of every child current, so that
+        # the uct score of a child never has to sum over its parents
+        self.visits[node_id] += count
+        parent_visits = self.parent_visits
+        for child_id in self.get_child_ids(node_id):
+            parent_visits[child_id] += count
+
+    def add_root_visits(self, node_id, count=1):
+        # a search root is visited without passing through a parent, so its
+        # own n(s) counts those visits to stay at least its visit count once
+        # a later search reaches it as a child
+        self.root_visits[node_id] += count
+        self.parent_visits[node_id] += count
+        self.add_visits(node_id, count)
+
+    def find_edge_id(self, parent_id, child_id):
+        edge_id = self.first_child_edges.item(parent_id)
+        while edge_id != NO_EDGE:
+            if self.edge_children.item(edge_id) == child_id:
+                return edge_id
+            edge_id = self.next_child_edges.item(edge_id)
+        return None
+
+    def index_all_nodes(self):
+        if self.mapped_keys is None:
+            return
+
+        for node_id, key in enumerate(self.mapped_keys.tolist()):
+            self.node_ids.setdefault(key, node_id)
+        for edge_id in range(self.num_edges):
+            self.edge_ids.setdefault((self.edge_parents.item(edge_id),
+                                      self.edge_children.item(edge_id)),
+                                     edge_id)
+        self.mapped_keys = None
+        self.num_mapped_nodes = 0
+
+    def merge(self, other):
+        if other.geometry is not None:
+            check_geometry(self, other.geometry)
+        other.index_all_nodes()
+
+        # statistics of the same canonical position are summed, whichever
+        # node id it has in either tree
+        node_ids = np.empty(other.num_nodes, dtype=np.int64)
+        for key, other_id in other.node_ids.items():
+            node_ids[other_id] = self.find_or_create_node_id_for_key(key)
+
+        for name in ["visits", "wins", "draws", "losses", "root_visits"]:
+            np.add.at(getattr(self, name), node_ids,
+                      getattr(other, name)[:other.num_nodes])
+
+        for parent_id, child_id in other.edge_ids:
+            self.add_edge(int(node_ids[parent_id]), int(node_ids[child_id]))
+
+        self.update_parent_visits()
+
+    def update_parent_visits(self):
+        edges = slice(0, self.num_edges)
+        self.parent_visits[:] = self.root_visits
+        np.add.at(self.parent_visits, self.edge_children[edges],
+                  self.visits[self.edge_parents[edges]])
+
+    def enforce_memory_cap(self, board):
+        if self.max_nodes is None or self.num_nodes <= self.max_nodes:
+            return
+
+        root_id = self.find_or_create_node_id(board)
+        keep = self.get_reachable_nodes(root_id)
+        if np.count_nonzero(keep) > self.max_nodes:
+            # keep the most visited of the reachable nodes, and the root
+            visits = np.where(keep, self.visits[:self.num_nodes], -1)
+            keep[:] = False
+            keep[np.argsort(-visits, kind="stable")[:self.max_nodes]] = True
+            keep[root_id] = True
+        self.retain(keep)
+
+    def get_reachable_nodes(self, root_id):
+        reachable = np.zeros(self.num_nodes, dtype=bool)
+        reachable[root_id] = True
+        stack = [root_id]
+        while stack:
+            for child_id in self.get_child_ids(stack.pop()):
+                if not reachable[child_id]:
+                    reachable[child_id] = True
+                    stack.append(child_id)
+        return reachable
+
+    def retain(self, keep):
+        self.index_all_nodes()
+
+        # node ids are renumbered, so Node views taken before are invalid
+        new_ids = np.cumsum(keep) - 1
+        num_kept = int(np.count_nonzero(keep))
+
+        node_ids = {key: int(new_ids[i]) for key, i in self.node_ids.items()
+                    if keep[i]}
+        edges = [(int(new_ids[p]), int(new_ids[c]))
+                 for p, c in self.edge_ids if keep[p] and keep[c]]
+        counters = {name: getattr(self, name)[:self.num_nodes][keep]
+                    for name in ["visits", "wins", "draws", "losses",
+                                 "parent_visits"]}
+
+        capacity = max(self.capacity, num_kept)
+        self.node_ids = node_ids
+        self.edge_ids = {}
+        self.num_nodes = num_kept
+        self.num_edges = 0
+        allocate(self, NODE_FIELDS, capacity)
+        allocate(self, EDGE_FIELDS, max(self.capacity, len(edges)))
+        for parent_id, child_id in edges:
+            self.add_edge(parent_id, child_id)
+
+        for name, values in counters.items():
+            getattr(self, name)[:num_kept] = values
+
+        # visits through pruned parents count as root visits, which keeps
+        # every child's visits within its n(s) for uct
+        self.update_parent_visits()
+        self.root_visits[:num_kept] = (counters["parent_visits"]
+                                       - self.parent_visits[:num_kept])
+        self.parent_visits[:num_kept] = counters["parent_visits"]
+
+    def get_parent_ids(self, node_id):
+        edge_id = self.first_parent_edges.item(node_id)
+        while edge_id != NO_EDGE:
+            yield self.edge_parents.item(edge_id)
+            edge_id = self.next_parent_edges.item(edge_id)
+
+    def get_child_ids(self, node_id):
+        edge_id = self.first_child_edges.item(node_id)
+        while edge_id != NO_EDGE:
+            yield self.edge_children.item(edge_id)
+            edge_id = self.next_child_edges.item(edge_id)
+
+    def get_total_parent_visits(self, node_id):
+        return self.parent_visits.item(node_id)
+
+    def get_size_in_bytes(self):
+        return sum(getattr(self, name).nbytes
+                   for name, _, _ in NODE_FIELDS + EDGE_FIELDS)
+
+
+def allocate(tree, fields, capacity):
+    for name, dtype, fill_value in fields:
+        setattr(tree, name, np.full(capacity, fill_value, dtype=dtype))
+
+
+def grow(tree, fields, size):
+    for name, dtype, fill_value in fields:
+        array = np.full(max(2 * size, INITIAL_TREE_CAPACITY), fill_value,
+                        dtype=dtype)
+        array[:size] = getattr(tree, name)[:size]
+        setattr(tree, name, array)
+
+
+def save_tree(tree, path):
+    tree.index_all_nodes()
+    if tree.node_ids and max(tree.node_ids) > MAX_MAPPED_KEY:
+        raise ValueError("position keys do not fit in 64 bits")
+
+    # nodes are renumbered in key order, so that a loaded tree can find them
+    # with a binary search instead of building a dict of every key
+    keys = np.empty(tree.num_nodes, dtype=np.uint64)
+    keys[list(tree.node_ids.values())] = list(tree.node_ids)
+    order = np.argsort(keys)
+    new_ids = np.empty(tree.num_nodes, dtype=np.int32)
+    new_ids[order] = np.arange(tree.num_nodes, dtype=np.int32)
+
+    nodes = np.empty(tree.num_nodes, dtype=NODE_DTYPE)
+    nodes["key"] = keys[order]
+    for name, _, _ in NODE_FIELDS:
+        nodes[name] = getattr(tree, name)[:tree.num_nodes][order]
+
+    edges = np.empty(tree.num_edges, dtype=EDGE_DTYPE)
+    for name, _, _ in EDGE_FIELDS:
+        edges[name] = getattr(tree, name)[:tree.num_edges]
+    edges["edge_parents"] = new_ids[edges["edge_parents"]]
+    edges["edge_children"] = new_ids[edges["edge_children"]]
+
+    os.makedirs(path, exist_ok=True)
+    save_geometry(tree.geometry, os.path.join(path, GEOMETRY_FILE))
+    save_array(nodes, os.path.join(path, NODES_FILE))
+    save_array(edges, os.path.join(path, EDGES_FILE))
+
+
+def load_tree(path, max_nodes=None):
+    # copy-on-write maps share pages with the file until a counter changes
+    nodes = np.load(os.path.join(path, NODES_FILE), mmap_mode="c")
+    edges = np.load(os.path.join(path, EDGES_FILE), mmap_mode="c")
+
+    tree = MCTSTree(max_nodes=max_nodes)
+    tree.geometry = load_geometry(os.path.join(path, GEOMETRY_FILE))
+    if len(nodes) == 0:
+        return tree
+
+    for name, _, _ in NODE_FIELDS:
+        setattr(tree, name, nodes[name])
+    for name, _, _ in EDGE_FIELDS:
+        setattr(tree, name, edges[name])
+    tree.num_nodes = tree.num_mapped_nodes = len(nodes)
+    tree.num_edges = len(edges)
+    tree.mapped_keys = nodes["key"]
+
+    return tree
+
+
+def get_counter(name):
+    def get(node):
+        return getattr(node.tree, name).item(node.node_id)
+
+    def set(node, value):
+        getattr(node.tree, name)[node.node_id] = value
+
+    return property(get, set)
 
 
 class Node:
-    def __init__(self):
-        self.parents = BoardCache()
-        self.visits = 0
-        self.wins = 0
-        self.losses = 0
-        self.draws = 0
+    __slots__ = ("tree", "node_id")
+
+    wins = get_counter("wins")
+    draws = get_counter("draws")
+    losses = get_counter("losses")
+
+    def __init__(self, tree, node_id):
+        self.tree = tree
+        self.node_id = node_id
+
+    @property
+    def visits(self):
+        return self.tree.visits.item(self.node_id)
+
+    @visits.setter
+    def visits(self, value):
+        self.tree.add_visits(self.node_id, value - self.visits)
 
     def add_parent_node(self, node_cache, parent_board):
-        result, found = self.parents.get_for_position(parent_board)
-        if found is False:
-            parent_node = find_or_create_node(node_cache, parent_board)
-            self.parents.set_for_position(parent_board, parent_node)
+        parent_id = node_cache.find_or_create_node_id(parent_board)
+        node_cache.add_edge(parent_id, self.node_id)
 
     def get_total_visits_for_parent_nodes(self):
-        return sum([parent_node.visits for parent_node
-                    in self.parents.cache.values()])
+        return self.tree.get_total_parent_visits(self.node_id)
 
     def value(self):
         if self.visits == 0:
@@ -33,16 +365,104 @@ class Node:
         return success_percentage
 
 
+nodecache = MCTSTree()
+
+
 def play_game_and_reset_playouts(x_strategy, o_strategy, node_cache=nodecache):
     node_cache.reset()
     board = play_game(x_strategy, o_strategy)
     node_cache.reset()
     return board
 
-def play_mcts_move_with_live_playouts(board, node_cache=nodecache, num_playouts=200):
-    perform_training_playouts(node_cache, board, num_playouts,
-                              display_progress=False)
-    return play_mcts_move(board, node_cache)
+def create_live_mcts_player(time_limit_ms=None, num_playouts=None,
+                            node_cache=nodecache, stats=None, playout=None):
+    def play(board):
+        return play_mcts_move_with_live_playouts(board, node_cache,
+                                                 num_playouts, time_limit_ms,
+                                                 stats, playout)
+
+    return play
+
+
+def play_mcts_move_with_live_playouts(board, node_cache=nodecache,
+                                      num_playouts=None, time_limit_ms=None,
+                                      stats=None, playout=None):
+    if num_playouts is None and time_limit_ms is None:
+        num_playouts = LIVE_PLAYOUTS
+
+    node_cache.enforce_memory_cap(board)
+
+    budget = PlayoutBudget(time_limit_ms, num_playouts)
+    perform_playouts_within_budget(node_cache, board, budget, None, playout)
+    if stats is not None:
+        stats.add(budget)
+    return play_most_visited_move(board, node_cache)
+
+
+def check_playout_budget(time_limit_ms, max_playouts):
+    if time_limit_ms is None and max_playouts is None:
+        raise ValueError("a time limit or a number of playouts is required")
+
+
+class PlayoutBudget:
+    def __init__(self, time_limit_ms=None, max_playouts=None):
+        check_playout_budget(time_limit_ms, max_playouts)
+        self.time_limit_ms = time_limit_ms
+        self.max_playouts = max_playouts
+        self.playouts = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def is_exhausted(self):
+        self.elapsed = time.perf_counter() - self.start
+        if self.max_playouts is not None and self.playouts >= self.max_playouts:
+            return True
+        return (self.time_limit_ms is not None
+                and self.elapsed * 1000 >= self.time_limit_ms)
+
+    def get_playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class PlayoutStats:
+    def __init__(self):
+        self.moves = 0
+        self.playouts = 0
+        self.elapsed = 0.0
+
+    def add(self, budget):
+        self.moves += 1
+        self.playouts += budget.playouts
+        self.elapsed += budget.elapsed
+
+    def get_playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def perform_playouts_within_budget(node_cache, board, budget, rng=None,
+                                   playout=None):
+    if playout is None:
+        playout = perform_game_playout
+
+    # the deadline is checked between playouts, so a move is always ready
+    # about one playout after the budget runs out
+    while not budget.is_exhausted():
+        playout(node_cache, board, rng)
+        budget.playouts += 1
+    return budget
+
+
+def play_most_visited_move(board, node_cache=nodecache):
+    move_indexes = board.get_valid_move_indexes()
+    visits = [get_visits(node_cache, board.play_move(mi))
+              for mi in move_indexes]
+    return board.play_move(move_indexes[visits.index(max(visits))])
+
+
+def get_visits(node_cache, board):
+    node_id = node_cache.find_node_id(board)
+    return 0 if node_id is None else node_cache.visits.item(node_id)
+
 
 def play_mcts_move(board, node_cache=nodecache):
     move_index_node_pairs = get_move_index_node_pairs(board, node_cache)
@@ -59,27 +479,105 @@ def get_move_index_node_pairs(board, node_cache):
 
 
 def perform_training_playouts(node_cache=nodecache, board=Board(),
-                              num_playouts=4000, display_progress=True):
+                              num_playouts=4000, display_progress=True,
+                              rng=None, randomize_ties=False):
     for game in range(num_playouts):
-        perform_game_playout(node_cache, board)
+        perform_game_playout(node_cache, board, rng, randomize_ties)
         if display_progress is True and (game+1) % (num_playouts / 10) == 0:
             print(f"{game+1}/{num_playouts} playouts...")
 
 
-def perform_game_playout(node_cache, board):
+def perform_game_playout(node_cache, board, rng=None, randomize_ties=False):
     game_history = [board]
 
     while not board.is_gameover():
-        move_index = choose_move(node_cache, board)
+        move_index = choose_move(node_cache, board,
+                                 rng if randomize_ties else None)
         board = board.play_move(move_index)
         game_history.append(board)
 
     backpropagate(node_cache, board, game_history)
 
 
-def choose_move(node_cache, parent_board):
-    move_value_pairs = calculate_values(node_cache, parent_board)
-    return max(move_value_pairs, key=lambda pair: pair[1])[0]
+def perform_four_phase_playouts(node_cache=nodecache, board=Board(),
+                                num_playouts=1000,
+                                num_rollouts=ROLLOUTS_PER_LEAF, rng=None,
+                                randomize_ties=False):
+    for _ in range(num_playouts):
+        perform_four_phase_playout(node_cache, board, rng, num_rollouts,
+                                   randomize_ties)
+
+
+def perform_four_phase_playout(node_cache, board, rng=None,
+                               num_rollouts=ROLLOUTS_PER_LEAF,
+                               randomize_ties=False):
+    node_cache.find_or_create_node_id(board)
+    path = [board]
+
+    # selection descends through fully expanded nodes, then expansion adds
+    # the first child that has no node yet as the one new leaf
+    while not board.is_gameover():
+        unexpanded = [mi for mi in board.get_valid_move_indexes()
+                      if node_cache.find_node_id(board.play_move(mi)) is None]
+        if unexpanded:
+            move_index = (unexpanded[0] if rng is None
+                          else rng.choice(unexpanded))
+            leaf = board.play_move(move_index)
+            node_cache.add_edge(node_cache.find_node_id(board),
+                                node_cache.find_or_create_node_id(leaf))
+            path.append(leaf)
+            break
+
+        board = board.play_move(choose_move(node_cache, board,
+                                            rng if randomize_ties else None))
+        path.append(board)
+
+    results = simulate(path[-1], num_rollouts, rng)
+    backpropagate_results(node_cache, path, results)
+
+
+def simulate(board, num_rollouts, rng=None):
+    if board.is_gameover():
+        return np.full(num_rollouts, board.get_game_result(), dtype=np.int8)
+
+    boards = np.repeat(board.board[np.newaxis], num_rollouts, axis=0)
+    play_randomly = create_random_batch_player(rng)
+    _, results = play_batch(boards, play_randomly, play_randomly,
+                            board.geometry)
+    return results
+
+
+def backpropagate_results(node_cache, path, results):
+    x_wins = int(np.count_nonzero(results == RESULT_X_WINS))
+    o_wins = int(np.count_nonzero(results == RESULT_O_WINS))
+    draws = len(results) - x_wins - o_wins
+
+    # as in backpropagate, a node counts results for the player who moved
+    # into it, the opponent of the player whose turn it is
+    for i, board in enumerate(path):
+        node_id = node_cache.find_node_id(board)
+        if i == 0:
+            node_cache.add_root_visits(node_id, len(results))
+        else:
+            node_cache.add_visits(node_id, len(results))
+        wins, losses = (o_wins, x_wins) if board.get_turn() == CELL_X else (
+            x_wins, o_wins)
+        node_cache.wins[node_id] += wins
+        node_cache.losses[node_id] += losses
+        node_cache.draws[node_id] += draws
+
+
+def choose_move(node_cache, parent_board, rng=None):
+    move_value_pairs = list(calculate_values(node_cache, parent_board))
+    move_index, best_value = max(move_value_pairs, key=lambda pair: pair[1])
+    if rng is None:
+        return move_index
+
+    # with an rng ties are broken at random, so that trees grown with
+    # different seeds explore different lines. Playouts only pass one when
+    # asked to, since first-max grows noticeably stronger trees
+    return rng.choice([mi for mi, value in move_value_pairs
+                       if value == best_value])
 
 
 def calculate_values(node_cache, parent_board):
@@ -91,54 +589,53 @@ def calculate_values(node_cache, parent_board):
 
 
 def calculate_value(node_cache, parent_board, board):
-    node = find_or_create_node(node_cache, board)
-    node.add_parent_node(node_cache, parent_board)
-    if node.visits == 0:
+    node_id = node_cache.find_or_create_node_id(board)
+    node_cache.add_edge(node_cache.find_or_create_node_id(parent_board),
+                        node_id)
+
+    visits = node_cache.visits.item(node_id)
+    if visits == 0:
         return math.inf
 
-    parent_node_visits = node.get_total_visits_for_parent_nodes()
+    parent_node_visits = node_cache.get_total_parent_visits(node_id)
 
-    assert node.visits <= parent_node_visits, \
+    assert visits <= parent_node_visits, \
         "child node visits should be a subset of visits to the parent node "
 
     exploration_term = (math.sqrt(2.0)
-                        * math.sqrt(math.log(parent_node_visits) / node.visits))
+                        * math.sqrt(math.log(parent_node_visits) / visits))
 
-    value = node.value() + exploration_term
+    node_value = (node_cache.wins.item(node_id)
+                  + node_cache.draws.item(node_id)) / visits
 
-    return value
+    return node_value + exploration_term
 
 
 def backpropagate(node_cache, final_board_position, game_history):
-    for board in game_history:
-        node = find_node(node_cache, board)
-        node.visits += 1
+    for i, board in enumerate(game_history):
+        node_id = find_node(node_cache, board).node_id
+        if i == 0:
+            node_cache.add_root_visits(node_id)
+        else:
+            node_cache.add_visits(node_id)
         if is_win(board.get_turn(), final_board_position):
-            node.wins += 1
+            node_cache.wins[node_id] += 1
         elif is_loss(board.get_turn(), final_board_position):
-            node.losses += 1
+            node_cache.losses[node_id] += 1
         elif is_draw(final_board_position):
-            node.draws += 1
+            node_cache.draws[node_id] += 1
         else:
             raise ValueError("Illegal game state")
 
 
 def find_node(node_cache, board):
-    result, found = node_cache.get_for_position(board)
-    assert found is True, "node must exist"
-    node, _ = result
-    return node
+    node_id = node_cache.find_node_id(board)
+    assert node_id is not None, "node must exist"
+    return Node(node_cache, node_id)
 
 
 def find_or_create_node(node_cache, board):
-    result, found = node_cache.get_for_position(board)
-    if found is False:
-        node = Node()
-        node_cache.set_for_position(board, node)
-        return node
-
-    node, _ = result
-    return node
+    return Node(node_cache, node_cache.find_or_create_node_id(board))
 
 
 def is_win(player, board):
@@ -1,62 +1,199 @@
+import math
 import random
+import time
 
 from tictac.board import BoardCache
-from tictac.board import CELL_O
+from tictac.board import CELL_X, CELL_O
 from tictac.board import is_empty
+from tictac.bitboard import count_bits
+from tictac.retrograde import choose_optimal_move
 
-cache = BoardCache()
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
 
+TRANSPOSITION_TABLE_CAPACITY = 2 ** 20
 
-def create_minimax_player(randomize):
-    def play(board):
-        return play_minimax_move(board, randomize)
+# heuristic values stay strictly between a loss and a win
+HEURISTIC_SCALE = 0.5
 
-    return play
+TIME_CHECK_INTERVAL = 256
 
 
-def play_minimax_move(board, randomize=False):
-    move_value_pairs = get_move_value_pairs(board)
-    move = filter_best_move(board, move_value_pairs, randomize)
+class MinimaxEngine:
+    def __init__(self, capacity=TRANSPOSITION_TABLE_CAPACITY, eviction="lru",
+                 perfect_play_table=None, evaluate=None, time_limit=None,
+                 node_limit=None, max_depth=None, fallback=None):
+        self.cache = BoardCache(capacity, eviction, fallback)
+        self.transpositions = BoardCache(capacity, eviction)
+        self.perfect_play_table = perfect_play_table
+        self.evaluate = (evaluate if evaluate is not None
+                         else evaluate_open_lines)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.nodes = 0
 
-    return board.play_move(move)
+    def create_player(self, randomize=False):
+        def play(board):
+            return self.play_move(board, randomize)
 
+        return play
 
-def get_move_value_pairs(board):
-    valid_move_indexes = board.get_valid_move_indexes()
+    def create_iterative_deepening_player(self):
+        def play(board):
+            move, _ = self.search_iteratively(board)
+            return board.play_move(move)
 
-    assert not is_empty(valid_move_indexes), "never call with an end position"
+        return play
+
+    def play_move(self, board, randomize=False):
+        table = self.perfect_play_table
+        if table is not None and table.covers(board):
+            move = choose_optimal_move(table, board, randomize)
+            return board.play_move(move)
+
+        move_value_pairs = self.get_move_value_pairs(board)
+        move = filter_best_move(board, move_value_pairs, randomize)
+
+        return board.play_move(move)
+
+    def get_move_value_pairs(self, board):
+        valid_move_indexes = board.get_valid_move_indexes()
+
+        assert not is_empty(valid_move_indexes), (
+            "never call with an end position")
+
+        return [(m, self.get_position_value(board.play_move(m)))
+                for m in valid_move_indexes]
+
+    def get_position_value(self, board):
+        return get_turn_sign(board) * self.negamax(board, -math.inf,
+                                                   math.inf)
+
+    def negamax(self, board, alpha, beta):
+        self.nodes += 1
+
+        if board.is_gameover():
+            return get_turn_sign(board) * board.get_game_result()
+
+        original_alpha = alpha
+
+        result, found = self.cache.get_for_position(board)
+        if found:
+            (value, bound), _ = result
+            if bound == EXACT:
+                return value
+            if bound == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        best_value = -math.inf
+        for child in order_children(board):
+            value = -self.negamax(child, -beta, -alpha)
+            best_value = max(best_value, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        self.cache.set_for_position(
+            board, (best_value, get_bound(best_value, original_alpha, beta)))
+
+        return best_value
+
+    def search_iteratively(self, board):
+        budget = SearchBudget(self.time_limit, self.node_limit)
+        try:
+            return search_iteratively(board, budget, self.transpositions,
+                                      self.max_depth, self.evaluate)
+        finally:
+            self.nodes += budget.nodes
 
-    move_value_pairs = [(m, get_position_value(board.play_move(m)))
-                        for m in valid_move_indexes]
+    def get_hit_rate(self):
+        return self.cache.stats.get_hit_rate()
 
-    return move_value_pairs
+    def get_num_entries(self):
+        return len(self.cache) + len(self.transpositions)
+
+    def get_size_in_bytes(self):
+        return (self.cache.get_size_in_bytes()
+                + self.transpositions.get_size_in_bytes())
+
+    def reset(self):
+        self.cache.reset()
+        self.transpositions.reset()
+        self.nodes = 0
+
+
+def create_minimax_player(randomize, perfect_play_table=None, engine=None):
+    if engine is None:
+        engine = (default_engine if perfect_play_table is None
+                  else MinimaxEngine(perfect_play_table=perfect_play_table))
+    return engine.create_player(randomize)
+
+
+def play_minimax_move(board, randomize=False, engine=None):
+    if engine is None:
+        engine = default_engine
+    return engine.play_move(board, randomize)
+
+
+def get_move_value_pairs(board):
+    return default_engine.get_move_value_pairs(board)
 
 
 def get_position_value(board):
-    result, found = cache.get_for_position(board)
-    if found:
-        return result[0]
+    return default_engine.get_position_value(board)
 
-    position_value = calculate_position_value(board)
 
-    cache.set_for_position(board, position_value)
+def negamax(board, alpha, beta):
+    return default_engine.negamax(board, alpha, beta)
 
-    return position_value
 
+def get_bound(value, alpha, beta):
+    if value <= alpha:
+        return UPPER_BOUND
+    if value >= beta:
+        return LOWER_BOUND
+    return EXACT
 
-def calculate_position_value(board):
-    if board.is_gameover():
-        return board.get_game_result()
 
-    valid_move_indexes = board.get_valid_move_indexes()
+def order_children(board):
+    # finishing moves first, then cells that take part in the most lines
+    lines_through_cell = board.geometry.lines_through_cell
+    children = [(board.play_move(m), len(lines_through_cell[m]))
+                for m in board.get_valid_move_indexes()]
+    children.sort(key=lambda c: (not c[0].is_gameover(), -c[1]))
+    return [child for child, _ in children]
 
-    values = [get_position_value(board.play_move(m))
-              for m in valid_move_indexes]
 
-    min_or_max = choose_min_or_max_for_comparison(board)
-    position_value = min_or_max(values)
+def order_moves(board, move_indexes):
+    lines_through_cell = board.geometry.lines_through_cell
+    return sorted(move_indexes, key=lambda m: -len(lines_through_cell[m]))
+
+
+def evaluate_open_lines(board):
+    x_lines = 0
+    o_lines = 0
+    for wm in board.geometry.win_masks:
+        x_in_line = board.x_bits & wm
+        o_in_line = board.o_bits & wm
+        if not o_in_line:
+            x_lines += 1 + count_bits(x_in_line)
+        if not x_in_line:
+            o_lines += 1 + count_bits(o_in_line)
+
+    total = x_lines + o_lines
+    if total == 0:
+        return 0.0
+    return HEURISTIC_SCALE * (x_lines - o_lines) / total
+
 
-    return position_value
+def get_turn_sign(board):
+    return 1 if board.get_turn() == CELL_X else -1
 
 
 def filter_best_move(board, move_value_pairs, randomize):
@@ -74,3 +211,126 @@ def filter_best_move(board, move_value_pairs, randomize):
 def choose_min_or_max_for_comparison(board):
     turn = board.get_turn()
     return min if turn == CELL_O else max
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchBudget:
+    def __init__(self, time_limit=None, node_limit=None, deadline=None):
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.start = time.perf_counter()
+        if deadline is None and time_limit is not None:
+            deadline = self.start + time_limit
+        self.deadline = deadline
+        self.nodes = 0
+
+    def count_node(self):
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if (self.deadline is not None
+                and self.nodes % TIME_CHECK_INTERVAL == 0
+                and self.is_past_deadline()):
+            raise SearchTimeout()
+
+    def is_past_deadline(self):
+        return (self.deadline is not None
+                and time.perf_counter() > self.deadline)
+
+
+def create_iterative_deepening_player(time_limit=None, node_limit=None,
+                                      max_depth=None,
+                                      evaluate=evaluate_open_lines):
+    engine = MinimaxEngine(evaluate=evaluate, time_limit=time_limit,
+                           node_limit=node_limit, max_depth=max_depth)
+    return engine.create_iterative_deepening_player()
+
+
+def search_iteratively(board, budget, transpositions, max_depth=None,
+                       evaluate=evaluate_open_lines):
+    valid_move_indexes = board.get_valid_move_indexes()
+
+    assert not is_empty(valid_move_indexes), "never call with an end position"
+
+    # searching as deep as there are empty cells reaches every end position
+    full_depth = len(valid_move_indexes)
+    if max_depth is not None:
+        full_depth = min(full_depth, max_depth)
+
+    best_move = order_moves(board, valid_move_indexes)[0]
+    completed_depth = 0
+    for depth in range(1, full_depth + 1):
+        try:
+            best_move = search_root(board, depth, best_move, budget,
+                                    transpositions, evaluate)
+        except SearchTimeout:
+            break
+        completed_depth = depth
+
+    return best_move, completed_depth
+
+
+def search_root(board, depth, previous_best_move, budget, transpositions,
+                evaluate):
+    move_indexes = order_moves(board, board.get_valid_move_indexes())
+    move_indexes.remove(previous_best_move)
+    move_indexes.insert(0, previous_best_move)
+
+    alpha = -math.inf
+    best_move = previous_best_move
+    for move_index in move_indexes:
+        value = -search(board.play_move(move_index), depth - 1, -math.inf,
+                        -alpha, budget, transpositions, evaluate)
+        if value > alpha:
+            alpha = value
+            best_move = move_index
+
+    return best_move
+
+
+def search(board, depth, alpha, beta, budget, transpositions, evaluate):
+    budget.count_node()
+
+    if board.is_gameover():
+        return get_turn_sign(board) * board.get_game_result()
+
+    if depth == 0:
+        return get_turn_sign(board) * evaluate(board)
+
+    original_alpha = alpha
+
+    result, found = transpositions.get_for_position(board)
+    if found:
+        (value, bound, entry_depth), _ = result
+        if entry_depth >= depth:
+            if bound == EXACT:
+                return value
+            if bound == LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+    best_value = -math.inf
+    for child in order_children(board):
+        value = -search(child, depth - 1, -beta, -alpha, budget,
+                        transpositions, evaluate)
+        best_value = max(best_value, value)
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break
+
+    transpositions.set_for_position(
+        board, (best_value, get_bound(best_value, original_alpha, beta),
+                depth))
+
+    return best_value
+
+
+default_engine = MinimaxEngine()
+
+cache = default_engine.cache
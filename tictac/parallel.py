@@ -0,0 +1,317 @@
+import os
+import math
+import time
+import sys
+import random
+import multiprocessing
+import weakref
+
+import numpy as np
+
+from tictac.board import (Board, play_game, collect_game_results,
+                          print_game_results, GameResults, is_empty)
+from tictac.cache import SharedTranspositionTable
+from tictac.mcts import MCTSTree, perform_training_playouts
+from tictac.minimax import (search, order_moves, evaluate_open_lines,
+                            SearchBudget, SearchTimeout)
+
+SHARED_TABLE_CAPACITY = 2 ** 20
+
+worker_strategies = None
+
+worker_search = None
+
+
+def play_games_in_parallel(total_games, x_strategy, o_strategy,
+                           play_single_game=play_game, processes=None,
+                           seed=None):
+    results = collect_game_results_in_parallel(total_games, x_strategy,
+                                               o_strategy, play_single_game,
+                                               processes, seed)
+
+    print_game_results(results)
+
+    return results
+
+
+def collect_game_results_in_parallel(total_games, x_strategy, o_strategy,
+                                     play_single_game=play_game,
+                                     processes=None, seed=None):
+    if processes is None:
+        processes = os.cpu_count()
+
+    # every game is seeded from its own index, so for strategies without
+    # state the merged results only depend on seed and total_games
+    shards = split_into_shards(total_games, processes)
+    entropy = np.random.SeedSequence(seed).entropy
+
+    # each shard runs in a freshly started worker, initialized from a
+    # snapshot of the strategies and any state they carry, such as q-tables
+    # or the mcts node cache. state built up while playing therefore never
+    # leaks from one shard into the next. with the fork start method
+    # closures are inherited rather than pickled
+    start = time.perf_counter()
+    work = [(first_game, num_games, entropy)
+            for first_game, num_games in shards]
+    if not can_fork():
+        # spawned workers would have to pickle the strategies, which fails
+        # for closures and reimports the calling script, so play the shards
+        # one after another in this process instead
+        init_worker(x_strategy, o_strategy, play_single_game)
+        shard_results = [play_shard(shard) for shard in work]
+    else:
+        context = get_multiprocessing_context()
+        with context.Pool(processes, initializer=init_worker,
+                          initargs=(x_strategy, o_strategy, play_single_game),
+                          maxtasksperchild=1) as pool:
+            shard_results = pool.map(play_shard, work, chunksize=1)
+
+    results = merge_results(shard_results)
+    results.elapsed = time.perf_counter() - start
+
+    return results
+
+
+def split_into_shards(total_games, num_shards):
+    shards = []
+    first_game = 0
+    for num_games in split_evenly(total_games, num_shards):
+        if num_games > 0:
+            shards.append((first_game, num_games))
+        first_game += num_games
+    return shards
+
+
+def can_fork():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def get_multiprocessing_context():
+    if can_fork():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def init_worker(x_strategy, o_strategy, play_single_game):
+    global worker_strategies
+    worker_strategies = (x_strategy, o_strategy, play_single_game)
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(1)
+
+
+def play_shard(shard):
+    first_game, num_games, entropy = shard
+    x_strategy, o_strategy, play_single_game = worker_strategies
+
+    results = GameResults()
+    for game in range(first_game, first_game + num_games):
+        seed_random_number_generators(
+            np.random.SeedSequence(entropy, spawn_key=(game,)))
+        results.merge(collect_game_results(1, x_strategy, o_strategy,
+                                           play_single_game))
+    return results
+
+
+def seed_random_number_generators(seed_sequence):
+    seed = int(seed_sequence.generate_state(1)[0])
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].manual_seed(seed)
+
+
+def merge_results(shard_results):
+    results = GameResults()
+
+    for shard_result in shard_results:
+        results.merge(shard_result)
+
+    return results
+
+
+def create_parallel_minimax_player(processes=None, time_limit=None,
+                                   max_depth=None,
+                                   evaluate=evaluate_open_lines,
+                                   table_capacity=SHARED_TABLE_CAPACITY):
+    # the pool and the shared table live as long as the player, so later
+    # moves reuse both the workers and the positions searched before
+    parallel_search = ParallelSearch(processes, evaluate, table_capacity)
+
+    def play(board):
+        move, _ = parallel_search.search(board, time_limit, max_depth)
+        return board.play_move(move)
+
+    return play
+
+
+def search_in_parallel(board, processes=None, time_limit=None, max_depth=None,
+                       evaluate=evaluate_open_lines,
+                       table_capacity=SHARED_TABLE_CAPACITY):
+    with ParallelSearch(processes, evaluate,
+                        table_capacity) as parallel_search:
+        return parallel_search.search(board, time_limit, max_depth)
+
+
+class ParallelSearch:
+    def __init__(self, processes=None, evaluate=evaluate_open_lines,
+                 table_capacity=SHARED_TABLE_CAPACITY):
+        self.processes = processes
+        self.evaluate = evaluate
+        self.table_capacity = table_capacity
+        self.geometry = None
+        self.pool = None
+        self.table = None
+        self.shared_alpha = None
+        self.finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        context = get_multiprocessing_context()
+        self.shared_alpha = context.Value("d", -math.inf)
+        self.table = SharedTranspositionTable(self.table_capacity)
+        self.pool = context.Pool(self.processes,
+                                 initializer=init_search_worker,
+                                 initargs=(self.table, self.shared_alpha,
+                                           self.evaluate))
+        self.finalizer = weakref.finalize(self, stop_search_pool, self.pool,
+                                          self.table)
+
+    def close(self):
+        if self.finalizer is not None:
+            self.finalizer()
+        self.pool = self.table = self.shared_alpha = self.finalizer = None
+
+    def search(self, board, time_limit=None, max_depth=None):
+        valid_move_indexes = board.get_valid_move_indexes()
+
+        assert not is_empty(valid_move_indexes), (
+            "never call with an end position")
+
+        # workers share one absolute deadline, so root moves that wait in
+        # the queue do not get a fresh time limit when they start
+        budget = SearchBudget(time_limit)
+
+        if self.pool is None:
+            self.start()
+        if board.geometry is not self.geometry:
+            # keys of different board sizes can coincide
+            self.table.clear()
+            self.geometry = board.geometry
+
+        full_depth = len(valid_move_indexes)
+        if max_depth is not None:
+            full_depth = min(full_depth, max_depth)
+
+        best_move = order_moves(board, valid_move_indexes)[0]
+        completed_depth = 0
+        for depth in range(1, full_depth + 1):
+            if budget.is_past_deadline():
+                break
+
+            move_indexes = order_moves(board, valid_move_indexes)
+            move_indexes.remove(best_move)
+            move_indexes.insert(0, best_move)
+
+            self.shared_alpha.value = -math.inf
+            outcomes = self.pool.map(search_root_move,
+                                     [(board, m, depth, budget.deadline)
+                                      for m in move_indexes], chunksize=1)
+            if any(value is None for _, value, _ in outcomes):
+                break
+
+            best_move = choose_best_root_move(outcomes)
+            completed_depth = depth
+
+        return best_move, completed_depth
+
+
+def stop_search_pool(pool, table):
+    pool.terminate()
+    pool.join()
+    table.release()
+
+
+def choose_best_root_move(outcomes):
+    # a move searched after the shared bound was raised may fail low and
+    # return only an upper bound, so pick among the exact values
+    exact_outcomes = [(m, value) for m, value, exact in outcomes if exact]
+    best_move, _ = max(exact_outcomes, key=lambda outcome: outcome[1])
+    return best_move
+
+
+def init_search_worker(table, shared_alpha, evaluate):
+    global worker_search
+    worker_search = (table, shared_alpha, evaluate)
+
+
+def search_root_move(root_move):
+    board, move_index, depth, deadline = root_move
+    table, shared_alpha, evaluate = worker_search
+
+    budget = SearchBudget(deadline=deadline)
+    if budget.is_past_deadline():
+        return move_index, None, False
+
+    alpha = shared_alpha.value
+    try:
+        value = -search(board.play_move(move_index), depth - 1, -math.inf,
+                        -alpha, budget, table, evaluate)
+    except SearchTimeout:
+        return move_index, None, False
+
+    with shared_alpha.get_lock():
+        if value > shared_alpha.value:
+            shared_alpha.value = value
+
+    return move_index, value, value > alpha
+
+
+def perform_training_playouts_in_parallel(board=None, num_playouts=4000,
+                                          processes=None, seed=None,
+                                          randomize_ties=False):
+    if board is None:
+        board = Board()
+    if processes is None:
+        processes = os.cpu_count()
+
+    playout_counts = split_evenly(num_playouts, processes)
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+
+    work = [(board, count, seed_sequence, randomize_ties)
+            for count, seed_sequence in zip(playout_counts, seeds)]
+    if not can_fork():
+        # as for games, a script that calls this at module scope would be
+        # reimported by spawned workers, so grow the trees in this process
+        trees = [grow_tree(w) for w in work]
+    else:
+        context = get_multiprocessing_context()
+        with context.Pool(processes) as pool:
+            trees = pool.map(grow_tree, work)
+
+    tree = MCTSTree()
+    for worker_tree in trees:
+        tree.merge(worker_tree)
+
+    return tree
+
+
+def split_evenly(total, parts):
+    size, remainder = divmod(total, parts)
+    return [size + (i < remainder) for i in range(parts)]
+
+
+def grow_tree(work):
+    board, num_playouts, seed_sequence, randomize_ties = work
+    rng = random.Random(int(seed_sequence.generate_state(1)[0]))
+
+    tree = MCTSTree()
+    perform_training_playouts(tree, board, num_playouts, False, rng,
+                              randomize_ties)
+    return tree
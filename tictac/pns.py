@@ -0,0 +1,122 @@
+import time
+
+from tictac.board import (BoardCache, CELL_X, CELL_O, RESULT_X_WINS,
+                          RESULT_O_WINS, RESULT_DRAW)
+from tictac.minimax import SearchBudget, SearchTimeout
+
+PROVEN = "proven"
+DISPROVEN = "disproven"
+UNKNOWN = "unknown"
+
+INFINITY = 2 ** 31
+
+WIN_RESULTS = {CELL_X: RESULT_X_WINS, CELL_O: RESULT_O_WINS}
+
+
+class ProofResult:
+    def __init__(self, status, nodes, elapsed):
+        self.status = status
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def get_nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProofSearch:
+    def __init__(self, attacker, target_results, budget, cache):
+        self.attacker = attacker
+        self.target_results = target_results
+        self.budget = budget
+        self.cache = cache
+
+    def get_proof_numbers(self, board):
+        # phi and delta are the proof and disproof numbers seen from the
+        # player to move: (pn, dn) for the attacker, (dn, pn) for the defender
+        if board.is_gameover():
+            attacker_succeeds = board.get_game_result() in self.target_results
+            mover_succeeds = attacker_succeeds == (board.get_turn()
+                                                   == self.attacker)
+            return (0, INFINITY) if mover_succeeds else (INFINITY, 0)
+
+        result, found = self.cache.get_for_position(board)
+        if found:
+            return result[0]
+        return 1, 1
+
+    def search(self, board, phi_threshold, delta_threshold):
+        self.budget.count_node()
+
+        if board.is_gameover():
+            return
+
+        children = [board.play_move(m) for m in board.get_valid_move_indexes()]
+        while True:
+            child_numbers = [self.get_proof_numbers(c) for c in children]
+            phi = min(delta for _, delta in child_numbers)
+            delta = min(sum(phi for phi, _ in child_numbers), INFINITY)
+            self.cache.set_for_position(board, (phi, delta))
+
+            if phi >= phi_threshold or delta >= delta_threshold:
+                return
+
+            best_index, second_delta = select_child(child_numbers)
+            child_phi, child_delta = child_numbers[best_index]
+            self.search(children[best_index],
+                        min(delta_threshold + child_phi - delta, INFINITY),
+                        min(phi_threshold, second_delta + 1))
+
+
+def select_child(child_numbers):
+    best_index = 0
+    best_delta = second_delta = INFINITY
+    for i, (_, delta) in enumerate(child_numbers):
+        if delta < best_delta:
+            best_index, best_delta, second_delta = i, delta, best_delta
+        elif delta < second_delta:
+            second_delta = delta
+    return best_index, second_delta
+
+
+def prove(board, attacker, target_results, time_limit=None, node_limit=None,
+          cache=None):
+    if cache is None:
+        cache = BoardCache()
+
+    budget = SearchBudget(time_limit, node_limit)
+    proof_search = ProofSearch(attacker, target_results, budget, cache)
+    try:
+        proof_search.search(board, INFINITY, INFINITY)
+    except SearchTimeout:
+        pass
+
+    phi, delta = proof_search.get_proof_numbers(board)
+    if board.get_turn() != attacker:
+        phi, delta = delta, phi
+
+    status = PROVEN if phi == 0 else DISPROVEN if delta == 0 else UNKNOWN
+    return ProofResult(status, budget.nodes,
+                       time.perf_counter() - budget.start)
+
+
+def prove_win(board, player, time_limit=None, node_limit=None):
+    return prove(board, player, {WIN_RESULTS[player]}, time_limit,
+                 node_limit)
+
+
+def prove_at_least_draw(board, player, time_limit=None, node_limit=None):
+    return prove(board, player, {WIN_RESULTS[player], RESULT_DRAW},
+                 time_limit, node_limit)
+
+
+def solve_with_proof_numbers(board, time_limit=None, node_limit=None):
+    win = prove_win(board, CELL_X, time_limit, node_limit)
+    if win.status == PROVEN:
+        return RESULT_X_WINS, [win]
+
+    draw = prove_at_least_draw(board, CELL_X, time_limit, node_limit)
+    if draw.status == PROVEN:
+        return RESULT_DRAW, [win, draw]
+    if draw.status == DISPROVEN:
+        return RESULT_O_WINS, [win, draw]
+    return None, [win, draw]
@@ -1,3 +1,4 @@
+import math
 from random import randrange
 
 import numpy as np
@@ -8,7 +9,10 @@ import torch
 from torch import nn
 
 from tictac.board import play_game, is_draw
-from tictac.board import (CELL_X, CELL_O, RESULT_X_WINS, RESULT_O_WINS)
+from tictac.transform import (get_all_orientations,
+                              get_all_move_index_orientations)
+from tictac.board import (CELL_X, CELL_O, CELL_EMPTY, RESULT_X_WINS,
+                          RESULT_O_WINS)
 
 WIN_VALUE = 1.0
 DRAW_VALUE = 1.0
@@ -38,7 +42,8 @@ class TicTacNet(nn.Module):
 
 
 class NetContext:
-    def __init__(self, policy_net, target_net, optimizer, loss_function):
+    def __init__(self, policy_net, target_net, optimizer, loss_function,
+                 augment_symmetries=False):
         self.policy_net = policy_net
 
         self.target_net = target_net
@@ -47,6 +52,7 @@ class NetContext:
 
         self.optimizer = optimizer
         self.loss_function = loss_function
+        self.augment_symmetries = augment_symmetries
 
 
 def create_qneural_player(net_context):
@@ -57,6 +63,14 @@ def create_qneural_player(net_context):
     return play
 
 
+def create_qneural_batch_player(net_context):
+    def play(boards, turn):
+        model = net_context.target_net
+        return select_valid_qneural_moves(boards, model)
+
+    return play
+
+
 def play_qneural_move(board, model):
     max_move_index, _ = select_valid_qneural_move(board, model)
     return board.play_move(max_move_index)
@@ -72,6 +86,14 @@ def select_valid_qneural_move(board, model):
     return max_move_index, q_value
 
 
+def select_valid_qneural_moves(boards, model):
+    with torch.no_grad():
+        q_values = model(torch.tensor(boards, dtype=torch.float))
+
+    q_values[torch.from_numpy(boards != CELL_EMPTY)] = -math.inf
+    return torch.argmax(q_values, dim=1).numpy()
+
+
 def get_valid_move_index_q_value_pairs(q_values, valid_move_indexes):
     valid_q_values = []
     for vmi in valid_move_indexes:
@@ -164,6 +186,11 @@ def update_training_gameover(net_context, move_history, q_learning_player,
 
 
 def backpropagate(net_context, position, move_index, target_value):
+    if net_context.augment_symmetries:
+        backpropagate_symmetries(net_context, position, move_index,
+                                 target_value)
+        return
+
     net_context.optimizer.zero_grad()
     output = net_context.policy_net(convert_to_tensor(position))
 
@@ -178,6 +205,27 @@ def backpropagate(net_context, position, move_index, target_value):
     net_context.optimizer.step()
 
 
+def backpropagate_symmetries(net_context, position, move_index,
+                             target_value):
+    net_context.optimizer.zero_grad()
+
+    geometry = position.geometry
+    boards = get_all_orientations(position.board,
+                                  geometry.symmetry_permutation_matrix)
+    move_indexes = get_all_move_index_orientations(
+        move_index, geometry.symmetry_inverse_permutation_matrix)
+    output = net_context.policy_net(torch.tensor(boards, dtype=torch.float))
+
+    target = output.clone().detach()
+    target[torch.arange(len(boards)), torch.from_numpy(move_indexes)] = (
+        target_value)
+    target[torch.from_numpy(boards != CELL_EMPTY)] = LOSS_VALUE
+
+    loss = net_context.loss_function(output, target)
+    loss.backward()
+    net_context.optimizer.step()
+
+
 def create_training_player(net_context, move_history, epsilon):
     def play(board):
         model = net_context.policy_net
@@ -5,9 +5,11 @@ import operator
 import itertools
 from collections import deque
 
-from tictac.board import BoardCache, Board
+from tictac.board import BoardCache, Board, board_from_position_key
 from tictac.board import play_game, play_random_move, is_draw
-from tictac.board import (CELL_X, CELL_O, RESULT_X_WINS, RESULT_O_WINS)
+from tictac.board import (CELL_X, CELL_O, CELL_EMPTY, RESULT_X_WINS,
+                          RESULT_O_WINS)
+from tictac.geometry import STANDARD_GEOMETRY
 
 WIN_VALUE = 1.0
 DRAW_VALUE = 1.0
@@ -43,8 +45,10 @@ class QTable:
         result, found = self.qtable.get_for_position(new_position)
         if found is True:
             _, t = result
+            geometry = new_position.geometry
             new_position_transformed = Board(
-                t.transform(new_position.board_2d).flatten())
+                t.transform_boards(new_position.board, geometry.dimensions),
+                geometry=geometry)
             self.qtable.set_for_position(new_position_transformed, qvalue)
             return
 
@@ -57,8 +61,7 @@ class QTable:
     def print_q_values(self):
         print(f"num q_values = {len(self.qtable.cache)}")
         for k, v in self.qtable.cache.items():
-            b = np.frombuffer(k, dtype=int)
-            board = Board(b)
+            board = board_from_position_key(k)
             board.print_board()
             print(f"qvalue = {v}")
 
@@ -80,6 +83,52 @@ def create_q_table_player(q_tables):
     return play
 
 
+def create_q_table_batch_player(q_tables, geometry=STANDARD_GEOMETRY):
+    # the player reads a snapshot of the q-values taken when it is created.
+    # they are stored densely by position key, with every orientation of a
+    # position filled in, so a whole batch of boards is one array lookup
+    q_values = get_average_q_values_by_position_key(q_tables, geometry)
+    cell_bits = 1 << np.arange(geometry.num_cells, dtype=np.int64)
+
+    def play(boards, turn):
+        boards = np.asarray(boards)
+        x_bits = (boards == CELL_X) @ cell_bits
+        o_bits = (boards == CELL_O) @ cell_bits
+        keys = geometry.to_position_key(x_bits, o_bits)
+        if turn == CELL_X:
+            move_bits = geometry.to_position_key(cell_bits, 0)
+        else:
+            move_bits = geometry.to_position_key(0, cell_bits)
+
+        child_q_values = q_values[keys[:, np.newaxis] | move_bits]
+        child_q_values[boards != CELL_EMPTY] = -np.inf
+        return np.argmax(child_q_values, axis=1)
+
+    return play
+
+
+def get_average_q_values_by_position_key(q_tables, geometry):
+    keys = np.arange(1 << (2 * geometry.num_cells))
+    x_bits, o_bits = geometry.from_position_key(keys)
+    popcount = np.array(geometry.popcount)
+    plies = popcount[x_bits] + popcount[o_bits]
+    initial_q_values = np.where(plies % 2 == 1, INITIAL_Q_VALUES_FOR_X,
+                                INITIAL_Q_VALUES_FOR_O)
+
+    total_q_values = np.zeros(len(keys))
+    for q_table in q_tables:
+        q_values = initial_q_values.copy()
+        for key, q_value in q_table.qtable.cache.items():
+            x, o = geometry.from_position_key(key)
+            for i in geometry.transform_indexes:
+                q_values[geometry.to_position_key(
+                    geometry.permute_mask(x, i),
+                    geometry.permute_mask(o, i))] = q_value
+        total_q_values += q_values
+
+    return total_q_values / len(q_tables)
+
+
 def play_q_table_move(board, q_tables=None):
     if q_tables is None:
         q_tables = qtables
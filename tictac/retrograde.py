@@ -0,0 +1,95 @@
+import os
+import random
+
+import numpy as np
+
+from tictac.board import CELL_X, RESULT_NOT_OVER
+from tictac.bitboard import NUM_CELLS, POPCOUNT, MASK_INDEXES
+from tictac.geometry import STANDARD_GEOMETRY
+from tictac.stateindex import NO_STATE, get_state_index
+
+perfect_play_tables = {}
+
+
+class PerfectPlayTable:
+    def __init__(self, state_index, values, optimal_move_masks):
+        self.state_index = state_index
+        self.values = values
+        self.optimal_move_masks = optimal_move_masks
+
+    def covers(self, board):
+        return (board.geometry is STANDARD_GEOMETRY
+                and not board.is_in_illegal_state()
+                and self.state_index.get_id(board) != NO_STATE)
+
+    def get_value(self, board):
+        return int(self.values[self.state_index.get_id(board)])
+
+    def get_optimal_move_indexes(self, board):
+        state_id = self.state_index.get_id(board)
+        return MASK_INDEXES[int(self.optimal_move_masks[state_id])]
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, values=self.values,
+                     optimal_move_masks=self.optimal_move_masks)
+
+    @staticmethod
+    def load(path, state_index=None):
+        if state_index is None:
+            state_index = get_state_index()
+        with np.load(path) as arrays:
+            return PerfectPlayTable(state_index, arrays["values"],
+                                    arrays["optimal_move_masks"])
+
+    @staticmethod
+    def build(state_index=None):
+        if state_index is None:
+            state_index = get_state_index()
+        values, optimal_move_masks = solve(state_index)
+        return PerfectPlayTable(state_index, values, optimal_move_masks)
+
+
+def solve(state_index):
+    results = state_index.results
+    values = np.where(results == RESULT_NOT_OVER, 0, results).astype(np.int8)
+    optimal_move_masks = np.zeros(len(state_index), dtype=np.uint16)
+
+    plies = np.array(POPCOUNT)[state_index.x_bits | state_index.o_bits]
+    move_bits = 1 << np.arange(NUM_CELLS)
+
+    # every child is one ply deeper, so walking back from the last ply means
+    # all child values are known before their parents are visited
+    for ply in range(NUM_CELLS - 1, -1, -1):
+        ids = np.flatnonzero((plies == ply) & (results == RESULT_NOT_OVER))
+        child_ids = state_index.child_ids[ids]
+        valid = child_ids != NO_STATE
+
+        signs = np.where(state_index.turns[ids] == CELL_X, 1, -1)
+        scores = np.where(valid, values[child_ids] * signs[:, np.newaxis], -2)
+        best_scores = scores.max(axis=1)
+
+        values[ids] = best_scores * signs
+        optimal = valid & (scores == best_scores[:, np.newaxis])
+        optimal_move_masks[ids] = optimal @ move_bits
+
+    return values, optimal_move_masks
+
+
+def get_perfect_play_table(path=None):
+    if path not in perfect_play_tables:
+        if path is not None and os.path.exists(path):
+            perfect_play_tables[path] = PerfectPlayTable.load(path)
+        else:
+            perfect_play_tables[path] = PerfectPlayTable.build()
+            if path is not None:
+                perfect_play_tables[path].save(path)
+
+    return perfect_play_tables[path]
+
+
+def choose_optimal_move(table, board, randomize=False):
+    move_indexes = table.get_optimal_move_indexes(board)
+    if not randomize:
+        return move_indexes[0]
+    return random.choice(move_indexes)
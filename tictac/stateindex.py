@@ -0,0 +1,152 @@
+import os
+
+import numpy as np
+
+from tictac.board import (CELL_X, CELL_O, RESULT_X_WINS, RESULT_O_WINS,
+                          RESULT_DRAW, RESULT_NOT_OVER,
+                          get_canonical_key_and_transform,
+                          board_from_position_key)
+from tictac.bitboard import (NUM_CELLS, FULL_MASK, POPCOUNT, IS_WIN,
+                             MASK_INDEXES, get_empty_mask, to_position_key,
+                             from_position_key)
+
+NO_STATE = -1
+
+NUM_POSITION_KEYS = 1 << (2 * NUM_CELLS)
+
+state_indexes = {}
+
+
+class StateIndex:
+    def __init__(self, x_bits, o_bits, canonical_ids, turns, results,
+                 valid_move_masks, child_ids):
+        self.x_bits = x_bits
+        self.o_bits = o_bits
+        self.canonical_ids = canonical_ids
+        self.turns = turns
+        self.results = results
+        self.valid_move_masks = valid_move_masks
+        self.child_ids = child_ids
+
+        self.ids_by_key = np.full(NUM_POSITION_KEYS, NO_STATE, dtype=np.int32)
+        keys = x_bits.astype(np.int64) | o_bits.astype(np.int64) << NUM_CELLS
+        self.ids_by_key[keys] = np.arange(len(keys), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.x_bits)
+
+    def get_id(self, board):
+        return int(self.ids_by_key[board.get_position_key()])
+
+    def get_canonical_id(self, board):
+        state_id = self.get_id(board)
+        if state_id == NO_STATE:
+            return NO_STATE
+        return int(self.canonical_ids[state_id])
+
+    def get_board(self, state_id):
+        key = to_position_key(int(self.x_bits[state_id]),
+                              int(self.o_bits[state_id]))
+        return board_from_position_key(key)
+
+    def get_valid_move_indexes(self, state_id):
+        return list(MASK_INDEXES[int(self.valid_move_masks[state_id])])
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, x_bits=self.x_bits, o_bits=self.o_bits,
+                     canonical_ids=self.canonical_ids, turns=self.turns,
+                     results=self.results,
+                     valid_move_masks=self.valid_move_masks,
+                     child_ids=self.child_ids)
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as arrays:
+            return StateIndex(arrays["x_bits"], arrays["o_bits"],
+                              arrays["canonical_ids"], arrays["turns"],
+                              arrays["results"], arrays["valid_move_masks"],
+                              arrays["child_ids"])
+
+    @staticmethod
+    def build():
+        positions = enumerate_positions()
+        ids = {position: i for i, position in enumerate(positions)}
+
+        count = len(positions)
+        canonical_ids = np.empty(count, dtype=np.int32)
+        turns = np.empty(count, dtype=np.int8)
+        results = np.empty(count, dtype=np.int8)
+        valid_move_masks = np.empty(count, dtype=np.uint16)
+        child_ids = np.full((count, NUM_CELLS), NO_STATE, dtype=np.int32)
+
+        for i, (x_bits, o_bits) in enumerate(positions):
+            canonical_ids[i] = ids[get_canonical_position(x_bits, o_bits)]
+            turns[i] = get_turn(x_bits, o_bits)
+            results[i] = get_result(x_bits, o_bits)
+            if results[i] == RESULT_NOT_OVER:
+                valid_move_masks[i] = get_empty_mask(x_bits | o_bits)
+            else:
+                valid_move_masks[i] = 0
+            for move_index in MASK_INDEXES[valid_move_masks[i]]:
+                child = play_move(x_bits, o_bits, move_index)
+                child_ids[i, move_index] = ids[child]
+
+        x_bits = np.array([p[0] for p in positions], dtype=np.uint16)
+        o_bits = np.array([p[1] for p in positions], dtype=np.uint16)
+
+        return StateIndex(x_bits, o_bits, canonical_ids, turns, results,
+                          valid_move_masks, child_ids)
+
+
+def enumerate_positions():
+    positions = [(0, 0)]
+    seen = {(0, 0)}
+
+    for x_bits, o_bits in positions:
+        if get_result(x_bits, o_bits) != RESULT_NOT_OVER:
+            continue
+        for move_index in MASK_INDEXES[get_empty_mask(x_bits | o_bits)]:
+            child = play_move(x_bits, o_bits, move_index)
+            if child not in seen:
+                seen.add(child)
+                positions.append(child)
+
+    return positions
+
+
+def play_move(x_bits, o_bits, move_index):
+    if get_turn(x_bits, o_bits) == CELL_X:
+        return x_bits | 1 << move_index, o_bits
+    return x_bits, o_bits | 1 << move_index
+
+
+def get_turn(x_bits, o_bits):
+    return CELL_X if POPCOUNT[x_bits | o_bits] % 2 == 0 else CELL_O
+
+
+def get_result(x_bits, o_bits):
+    if IS_WIN[x_bits]:
+        return RESULT_X_WINS
+    if IS_WIN[o_bits]:
+        return RESULT_O_WINS
+    if x_bits | o_bits == FULL_MASK:
+        return RESULT_DRAW
+    return RESULT_NOT_OVER
+
+
+def get_canonical_position(x_bits, o_bits):
+    key, _ = get_canonical_key_and_transform(x_bits, o_bits)
+    return from_position_key(key)
+
+
+def get_state_index(path=None):
+    if path not in state_indexes:
+        if path is not None and os.path.exists(path):
+            state_indexes[path] = StateIndex.load(path)
+        else:
+            state_indexes[path] = StateIndex.build()
+            if path is not None:
+                state_indexes[path].save(path)
+
+    return state_indexes[path]
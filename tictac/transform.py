@@ -1,8 +1,41 @@
 import numpy as np
 
 
-class Transform:
+class Permutable:
+    def __init__(self):
+        self.permutations = {}
+        self.inverse_permutations = {}
+
+    def get_permutation(self, dimensions):
+        if dimensions not in self.permutations:
+            self.permutations[dimensions] = compile_permutation(self,
+                                                                dimensions)
+        return self.permutations[dimensions]
+
+    def get_inverse_permutation(self, dimensions):
+        if dimensions not in self.inverse_permutations:
+            self.inverse_permutations[dimensions] = invert_permutation(
+                self.get_permutation(dimensions))
+        return self.inverse_permutations[dimensions]
+
+    def transform_boards(self, boards, dimensions):
+        return np.asarray(boards)[..., self.get_permutation(dimensions)]
+
+    def reverse_boards(self, boards, dimensions):
+        inverse = self.get_inverse_permutation(dimensions)
+        return np.asarray(boards)[..., inverse]
+
+    def transform_move_indexes(self, move_indexes, dimensions):
+        inverse = self.get_inverse_permutation(dimensions)
+        return inverse[move_indexes]
+
+    def reverse_move_indexes(self, move_indexes, dimensions):
+        return self.get_permutation(dimensions)[move_indexes]
+
+
+class Transform(Permutable):
     def __init__(self, *operations):
+        super().__init__()
         self.operations = operations
 
     def transform(self, target):
@@ -16,7 +49,7 @@ class Transform:
         return target
 
 
-class Identity:
+class Identity(Permutable):
     @staticmethod
     def transform(matrix2d):
         return matrix2d
@@ -26,8 +59,9 @@ class Identity:
         return matrix2d
 
 
-class Rotate90:
+class Rotate90(Permutable):
     def __init__(self, number_of_rotations):
+        super().__init__()
         self.number_of_rotations = number_of_rotations
         self.op = np.rot90
 
@@ -38,8 +72,9 @@ class Rotate90:
         return self.op(transformed_matrix2d, -self.number_of_rotations)
 
 
-class Flip:
+class Flip(Permutable):
     def __init__(self, op):
+        super().__init__()
         self.op = op
 
     def transform(self, matrix2d):
@@ -51,3 +86,33 @@ class Flip:
 
 def reverse(items):
     return items[::-1]
+
+
+def compile_permutation(transform, dimensions):
+    rows, cols = dimensions
+    cell_indexes = np.arange(rows * cols).reshape(dimensions)
+    permutation = transform.transform(cell_indexes).flatten()
+    permutation.setflags(write=False)
+    return permutation
+
+
+def compile_permutations(transforms, dimensions):
+    return np.array([t.get_permutation(dimensions) for t in transforms])
+
+
+def invert_permutation(permutation):
+    inverse = np.argsort(permutation)
+    inverse.setflags(write=False)
+    return inverse
+
+
+def get_all_orientations(boards, permutations):
+    return np.asarray(boards)[..., permutations]
+
+
+def invert_permutations(permutations):
+    return np.argsort(permutations, axis=-1)
+
+
+def get_all_move_index_orientations(move_indexes, inverse_permutations):
+    return inverse_permutations[:, move_indexes]